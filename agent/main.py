@@ -2,35 +2,82 @@ from __future__ import annotations
 
 import argparse
 import base64
+import functools
+import json
 import logging
 import os
+import struct
 import sys
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 
 LOG = logging.getLogger("inspect-agent")
 
 DEFAULT_POLL_INTERVAL = 10
 DEFAULT_BATCH_SIZE = 1
 DEFAULT_TIMEOUT = 15
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+PROM_QUERY_WORKERS = 8
+PROM_CACHE_TTL = 60
+PROM_CACHE_SIZE = 128
+# 长轮询单次最长等待时间，需不超过服务端的上限（60 秒）。
+LONG_POLL_MAX_WAIT = 30
+
+_UTC = timezone.utc
+
+# 配置缓存文件头：YAML 文件的 mtime_ns 与 size，二者一致时直接复用解析结果。
+_CONFIG_CACHE_HEADER = struct.Struct("<qq")
+
+
+def _json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "y", "on"})
 
 
 def _as_bool(value: Any) -> bool:
-    if isinstance(value, bool):
-        return value
-    if value is None:
+    if value is True:
+        return True
+    if value is None or value is False:
         return False
-    value_str = str(value).strip().lower()
-    return value_str in {"1", "true", "yes", "y", "on"}
+    if isinstance(value, int):
+        return value == 1
+    return str(value).strip().lower() in _TRUTHY
 
 
 def _as_int(value: Any, default: int) -> int:
+    if isinstance(value, int):
+        return value
     try:
         return int(value)
     except (TypeError, ValueError):
@@ -52,13 +99,26 @@ class AgentConfig:
     batch_size: int = DEFAULT_BATCH_SIZE
     verify_ssl: bool = True
     request_timeout: int = DEFAULT_TIMEOUT
+    # Token 文件的 (mtime_ns, 内容) 缓存，文件未变化时不再重复读取。
+    _token_cache: Optional[tuple[int, Optional[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def load_token(self) -> Optional[str]:
         if self.token:
             return self.token
-        if self.token_file and self.token_file.exists():
-            return self.token_file.read_text(encoding="utf-8").strip() or None
-        return None
+        if not self.token_file:
+            return None
+        try:
+            mtime_ns = self.token_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._token_cache = None
+            return None
+        if self._token_cache is not None and self._token_cache[0] == mtime_ns:
+            return self._token_cache[1]
+        token = self.token_file.read_text(encoding="utf-8").strip() or None
+        self._token_cache = (mtime_ns, token)
+        return token
 
     def save_token(self, token: str) -> None:
         if not self.token_file:
@@ -74,13 +134,58 @@ def _load_yaml_config(path: Optional[str]) -> Dict[str, Any]:
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"找不到配置文件：{file_path}")
+    st = file_path.stat()
+    header = _CONFIG_CACHE_HEADER.pack(st.st_mtime_ns, st.st_size)
+    cache_path = file_path.with_suffix(file_path.suffix + ".cache.json")
+    cached = _read_config_cache(cache_path, header)
+    if cached is not None:
+        return cached
     with file_path.open("r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh) or {}
+        data = yaml.load(fh, Loader=_YamlLoader) or {}
     if not isinstance(data, dict):
         raise ValueError("配置文件需为 YAML 对象。")
+    _write_config_cache(cache_path, header, data)
     return data
 
 
+def _read_config_cache(cache_path: Path, header: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        with cache_path.open("rb") as fh:
+            if fh.read(len(header)) != header:
+                return None
+            data = _json_loads(fh.read())
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        LOG.debug("忽略无法读取的配置缓存 %s：%s", cache_path, exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_config_cache(cache_path: Path, header: bytes, data: Dict[str, Any]) -> None:
+    # 缓存用 JSON 而非 pickle，读取时不会执行任意代码；含日期、非字符串键等
+    # JSON 无法原样还原的配置不写缓存，避免读回的结果与 YAML 解析结果不一致。
+    try:
+        payload = _json_dumps(data)
+        if _json_loads(payload) != data:
+            return
+    except (TypeError, ValueError):
+        return
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            fh.write(header)
+            fh.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        # 配置目录可能是只读挂载（如 ConfigMap），此时仅放弃缓存。
+        LOG.debug("无法写入配置缓存 %s：%s", cache_path, exc)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
 def load_config(config_path: Optional[str]) -> AgentConfig:
     raw = _load_yaml_config(config_path)
     server_cfg = raw.get('server', {})
@@ -165,12 +270,34 @@ def load_config(config_path: Optional[str]) -> AgentConfig:
         ),
     )
     return config
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 class AgentClient:
     def __init__(self, config: AgentConfig) -> None:
         self.config = config
         self.session = requests.Session()
         self.session.verify = config.verify_ssl
-        self.token: Optional[str] = config.token
+        # Server 与 Prometheus 共用同一连接池，心跳、拉取与查询均复用长连接。
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            # 任务并发处理时每个任务占用一条连接，连接池不应小于 batch_size。
+            pool_maxsize=max(HTTP_POOL_MAXSIZE, config.batch_size + 2),
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self.token: Optional[str] = None
+        if config.token:
+            self._set_token(config.token)
         if not self.session.verify:
             requests.packages.urllib3.disable_warnings(  # type: ignore[attr-defined]
                 category=requests.packages.urllib3.exceptions.InsecureRequestWarning  # type: ignore[attr-defined]
@@ -179,14 +306,25 @@ class AgentClient:
     def load_token_from_disk(self) -> None:
         cached = self.config.load_token()
         if cached:
-            self.token = cached
+            self._set_token(cached)
             self.config.token = cached
             LOG.info("已从本地缓存加载 Agent Token。")
 
-    def _headers(self) -> Dict[str, str]:
+    def _set_token(self, token: str) -> None:
+        self.token = token
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _require_token(self) -> None:
         if not self.token:
             raise RuntimeError("缺少 Agent Token。")
-        return {"Authorization": f"Bearer {self.token}"}
+
+    def _post_json(self, url: str, payload: Any) -> requests.Response:
+        return self.session.post(
+            url,
+            data=_json_dumps(payload),
+            headers=_JSON_HEADERS,
+            timeout=self.config.request_timeout,
+        )
 
     def register_if_needed(self, cluster_payload: Optional[Dict[str, Any]]) -> None:
         if self.token:
@@ -205,63 +343,63 @@ class AgentClient:
             "正在使用注册 Token 引导 Agent（cluster=%s）。",
             cluster_payload.get("name"),
         )
-        resp = self.session.post(
-            f"{self.config.server_base}/agent/bootstrap",
-            json=payload,
-            timeout=self.config.request_timeout,
-        )
+        resp = self._post_json(f"{self.config.server_base}/agent/bootstrap", payload)
         resp.raise_for_status()
-        self.token = registration_token
+        self._set_token(registration_token)
         self.config.token = registration_token
         if self.config.token_file:
             self.config.save_token(self.token)
 
     def send_heartbeat(self) -> None:
-        payload = {"reported_at": datetime.now(timezone.utc).isoformat()}
-        resp = self.session.post(
-            f"{self.config.server_base}/agent/heartbeat",
-            json=payload,
-            headers=self._headers(),
-            timeout=self.config.request_timeout,
-        )
+        self._require_token()
+        payload = {"reported_at": datetime.now(_UTC).isoformat(timespec="seconds")}
+        resp = self._post_json(f"{self.config.server_base}/agent/heartbeat", payload)
         resp.raise_for_status()
 
-    def fetch_tasks(self, limit: int) -> List[Dict[str, Any]]:
+    def fetch_tasks(self, limit: int, wait: int = 0) -> List[Dict[str, Any]]:
+        self._require_token()
+        params: Dict[str, Any] = {"limit": limit}
+        if wait > 0:
+            params["wait"] = wait
         resp = self.session.get(
             f"{self.config.server_base}/agent/tasks",
-            params={"limit": limit},
-            headers=self._headers(),
-            timeout=self.config.request_timeout + self.config.poll_interval,
+            params=params,
+            timeout=self.config.request_timeout + wait,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         if not isinstance(data, list):
             raise RuntimeError("服务端返回的任务列表格式异常。")
         return data
 
     def claim_run(self, run_id: int) -> Dict[str, Any]:
+        self._require_token()
         resp = self.session.post(
             f"{self.config.server_base}/agent/runs/{run_id}/claim",
-            headers=self._headers(),
             timeout=self.config.request_timeout,
         )
         resp.raise_for_status()
-        return resp.json()
+        return _json_loads(resp.content)
 
     def submit_results(
         self,
         run_id: int,
         results: Iterable[Dict[str, Any]],
     ) -> Dict[str, Any]:
-        payload = {"results": list(results)}
-        resp = self.session.post(
-            f"{self.config.server_base}/agent/runs/{run_id}/results",
-            json=payload,
-            headers=self._headers(),
-            timeout=self.config.request_timeout,
+        self._require_token()
+        payload = {"results": results if isinstance(results, list) else list(results)}
+        resp = self._post_json(
+            f"{self.config.server_base}/agent/runs/{run_id}/results", payload
         )
         resp.raise_for_status()
-        return resp.json()
+        return _json_loads(resp.content)
+
+
+# 心跳与任务拉取相互独立，通过该线程池并发发出以节省一次往返。
+_POLL_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-poll")
+
+# 会话上持久化了 Server 的 Authorization 头，请求 Prometheus 时需显式移除。
+_NO_SERVER_AUTH = {"Authorization": None}
 
 
 class PrometheusExecutor:
@@ -269,6 +407,10 @@ class PrometheusExecutor:
         self.base_url = base_url.rstrip("/") if base_url else None
         self.session = session
         self.timeout = timeout
+        # 按 (PromQL, 时间桶) 缓存成功的查询结果，时间桶切换后自然失效；失败不会被缓存。
+        self._cached_query = functools.lru_cache(maxsize=PROM_CACHE_SIZE)(
+            self._query_in_bucket
+        )
 
     def available(self) -> bool:
         return bool(self.base_url)
@@ -276,17 +418,40 @@ class PrometheusExecutor:
     def query(self, promql: str) -> Dict[str, Any]:
         if not self.base_url:
             raise RuntimeError("未配置 Prometheus 地址。")
-        resp = self.session.get(
+        # 使用表单 POST，避免较长的 PromQL 超出代理或服务端的 URL 长度限制。
+        resp = self.session.post(
             f"{self.base_url}/api/v1/query",
-            params={"query": promql},
+            data={"query": promql},
+            headers=_NO_SERVER_AUTH,
             timeout=self.timeout,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         if data.get("status") != "success":
             raise RuntimeError(data.get("error", "Prometheus 查询失败"))
         return data.get("data", {})
 
+    def _query_in_bucket(self, promql: str, bucket: int) -> Dict[str, Any]:
+        return self.query(promql)
+
+    def query_cached(self, promql: str) -> Dict[str, Any]:
+        return self._cached_query(promql, int(time.time() // PROM_CACHE_TTL))
+
+    def query_many(self, queries: List[str]) -> List[tuple[bool, Any]]:
+        """并发执行多条 PromQL，按输入顺序返回 (是否成功, 数据或异常)。"""
+
+        def _safe_query(promql: str) -> tuple[bool, Any]:
+            try:
+                return True, self.query_cached(promql)
+            except Exception as exc:
+                return False, exc
+
+        if len(queries) <= 1:
+            return [_safe_query(promql) for promql in queries]
+        workers = min(len(queries), PROM_QUERY_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-prom") as pool:
+            return list(pool.map(_safe_query, queries))
+
 
 class AgentRunner:
     def __init__(self, config: AgentConfig, client: AgentClient) -> None:
@@ -308,71 +473,144 @@ class AgentRunner:
                 data = path.read_bytes()
             except FileNotFoundError as exc:
                 raise RuntimeError(f"无法读取 kubeconfig 文件：{path}") from exc
-            payload["kubeconfig_b64"] = base64.b64encode(data).decode("utf-8")
+            encoded = base64.b64encode(data)
+            # 编码完成后立即释放原始内容，避免大 kubeconfig 在内存中同时保留多份。
+            del data
+            payload["kubeconfig_b64"] = encoded.decode("ascii")
             payload["kubeconfig_name"] = path.name
         return payload
 
     def run_forever(self, once: bool = False) -> None:
         LOG.info("Agent 已启动，轮询间隔 %s 秒。", self.config.poll_interval)
-        while True:
-            has_task = False
+        if once:
             try:
-                has_task = self.run_once()
-            except KeyboardInterrupt:
-                LOG.info("收到中断信号，准备退出。")
-                raise
+                self.run_once()
             except Exception as exc:
                 LOG.exception("执行周期失败：%s", exc)
-            if once:
-                break
-            sleep_seconds = 1 if has_task else max(1, self.config.poll_interval)
-            time.sleep(sleep_seconds)
-
-    def run_once(self) -> bool:
+            return
+        interval = max(1, self.config.poll_interval)
+        wait = min(interval, LONG_POLL_MAX_WAIT)
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(stop, interval),
+            name="agent-heartbeat",
+            daemon=True,
+        )
+        heartbeat.start()
         try:
-            self.client.send_heartbeat()
-        except Exception as exc:
-            LOG.warning("心跳上报失败：%s", exc)
+            while True:
+                started = time.monotonic()
+                has_task = False
+                try:
+                    has_task = self.run_once(wait=wait, heartbeat=False)
+                except KeyboardInterrupt:
+                    raise
+                except Exception as exc:
+                    LOG.exception("执行周期失败：%s", exc)
+                if has_task:
+                    continue
+                # 长轮询已在服务端等待过时直接进入下一轮；请求失败或服务端不支持 wait
+                # 参数而立即返回时，补足剩余的轮询间隔，避免空转。
+                remaining = interval - (time.monotonic() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+        except KeyboardInterrupt:
+            LOG.info("收到中断信号，准备退出。")
+            raise
+        finally:
+            stop.set()
+
+    def _heartbeat_loop(self, stop: threading.Event, interval: int) -> None:
+        while not stop.is_set():
+            try:
+                self.client.send_heartbeat()
+            except Exception as exc:
+                LOG.warning("心跳上报失败：%s", exc)
+            stop.wait(interval)
+
+    def run_once(self, wait: int = 0, heartbeat: bool = True) -> bool:
+        fetch = _POLL_EXECUTOR.submit(
+            self.client.fetch_tasks, limit=max(1, self.config.batch_size), wait=wait
+        )
+        if heartbeat:
+            heartbeat_error = _POLL_EXECUTOR.submit(self.client.send_heartbeat).exception()
+            if heartbeat_error is not None:
+                LOG.warning("心跳上报失败：%s", heartbeat_error)
         try:
-            tasks = self.client.fetch_tasks(limit=max(1, self.config.batch_size))
+            tasks = fetch.result()
         except Exception as exc:
             LOG.error("拉取任务失败：%s", exc)
             return False
         if not tasks:
             LOG.debug("暂无待执行任务。")
             return False
-        for task in tasks:
-            run_id = task.get("run_id")
-            if run_id is None:
-                LOG.warning("收到异常任务：%s", task)
-                continue
-            try:
-                self.client.claim_run(run_id)
-            except requests.HTTPError as exc:
-                LOG.warning("领取巡检 %s 失败：%s", run_id, exc.response.text if exc.response else exc)
-                continue
-            except Exception as exc:
-                LOG.warning("领取巡检 %s 失败：%s", run_id, exc)
-                continue
-            results = self._execute_items(task)
-            try:
-                self.client.submit_results(run_id, results)
-                LOG.info("巡检 %s 已回传结果。", run_id)
-            except Exception as exc:
-                LOG.error("上报巡检 %s 结果失败：%s", run_id, exc)
+        workers = min(len(tasks), max(1, self.config.batch_size))
+        if workers == 1:
+            for task in tasks:
+                self._process_task(task)
+            return True
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-task") as pool:
+            futures = [pool.submit(self._process_task, task) for task in tasks]
+            for future in as_completed(futures):
+                exc = future.exception()
+                if exc is not None:
+                    LOG.error("处理巡检任务失败：%s", exc)
+        return True
+
+    def _process_task(self, task: Dict[str, Any]) -> bool:
+        run_id = task.get("run_id")
+        if run_id is None:
+            LOG.warning("收到异常任务：%s", task)
+            return False
+        try:
+            self.client.claim_run(run_id)
+        except requests.HTTPError as exc:
+            # 读取响应体代价较高，仅在 WARNING 级别生效时才取出。
+            if LOG.isEnabledFor(logging.WARNING):
+                response = exc.response
+                LOG.warning(
+                    "领取巡检 %s 失败：%s",
+                    run_id,
+                    response.text if response is not None else exc,
+                )
+            return False
+        except Exception as exc:
+            LOG.warning("领取巡检 %s 失败：%s", run_id, exc)
+            return False
+        results = self._execute_items(task)
+        try:
+            self.client.submit_results(run_id, results)
+            LOG.info("巡检 %s 已回传结果。", run_id)
+        except Exception as exc:
+            LOG.error("上报巡检 %s 结果失败：%s", run_id, exc)
+            return False
         return True
 
     def _execute_items(self, task: Dict[str, Any]) -> List[Dict[str, Any]]:
         items = task.get("items") or []
-        results: List[Dict[str, Any]] = []
         cluster_id = task.get("cluster_id")
+        entries: List[tuple[Any, str, Optional[str]]] = []
         for item in items:
             item_id = item.get("id")
             name = item.get("name") or f"item-{item_id}"
             config = item.get("config") or {}
-            promql = config.get("promql")
+            entries.append((item_id, name, config.get("promql")))
+
+        # 先收集全部 PromQL 并发查询，再按原顺序组装结果。
+        outcomes: Dict[int, tuple[bool, Any]] = {}
+        if self.prom.available():
+            pending = [(idx, promql) for idx, (_, _, promql) in enumerate(entries) if promql]
+            if pending:
+                answers = self.prom.query_many([promql for _, promql in pending])
+                outcomes = {idx: answer for (idx, _), answer in zip(pending, answers)}
+
+        results: List[Dict[str, Any]] = []
+        for idx, (item_id, name, promql) in enumerate(entries):
             if promql:
-                status, detail, suggestion = self._run_promql(name, promql, cluster_id)
+                status, detail, suggestion = self._run_promql(
+                    name, cluster_id, outcomes.get(idx)
+                )
             else:
                 status = "warning"
                 detail = "未提供 PromQL 配置，任务已跳过。"
@@ -390,21 +628,20 @@ class AgentRunner:
     def _run_promql(
         self,
         item_name: str,
-        promql: str,
         cluster_id: Optional[int],
+        outcome: Optional[tuple[bool, Any]],
     ) -> tuple[str, str, Optional[str]]:
-        if not self.prom.available():
+        if outcome is None:
             return (
                 "warning",
                 f"未配置 Prometheus 地址，无法执行 {item_name} 的 PromQL。",
                 "配置 prometheus.base_url 或在环境变量 INSPECT_AGENT_PROM_URL 中提供地址。",
             )
-        try:
-            data = self.prom.query(promql)
-        except Exception as exc:
+        ok, data = outcome
+        if not ok:
             return (
                 "failed",
-                f"PromQL 查询失败：{exc}",
+                f"PromQL 查询失败：{data}",
                 "检查 Prometheus 网络连通性与认证配置。",
             )
         result = data.get("result") or []
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.5
+AUDIT_FLUSH_BATCH_SIZE = 200
+# 写库失败时保留待重试的最大条数，超出后丢弃最旧的记录。
+AUDIT_RETRY_MAX_ROWS = 10000
+
+
+class AuditLogBuffer:
+    """缓冲审计日志，由后台线程按时间或数量批量写入，避免每次操作单独提交。"""
+
+    def __init__(
+        self,
+        *,
+        interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = AUDIT_FLUSH_BATCH_SIZE,
+    ) -> None:
+        self._interval = interval
+        self._batch_size = batch_size
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._retry_rows: List[Dict[str, Any]] = []
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        self._stop.set()
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def put(
+        self,
+        *,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int],
+        description: Optional[str] = None,
+    ) -> None:
+        self._queue.put(
+            {
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "description": description,
+                "created_at": models.utcnow(),
+            }
+        )
+        if self._stop.is_set():
+            # 已停止（如应用关闭期间）不再重启后台线程，直接同步写入。
+            self.flush()
+            return
+        if self._thread is None:
+            self.start()
+        if self._queue.qsize() >= self._batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """立即写入当前缓冲的全部审计日志，返回写入条数。"""
+        with self._flush_lock:
+            rows = self._retry_rows
+            self._retry_rows = []
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not rows:
+                return 0
+            try:
+                with SessionLocal() as db:
+                    db.execute(insert(models.AuditLog), rows)
+                    db.commit()
+            except Exception:
+                logger.exception("Failed to flush %d audit log entries", len(rows))
+                dropped = len(rows) - AUDIT_RETRY_MAX_ROWS
+                if dropped > 0:
+                    logger.warning("Dropping %d oldest audit log entries after repeated flush failures", dropped)
+                    rows = rows[dropped:]
+                self._retry_rows = rows
+                return 0
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+audit_buffer = AuditLogBuffer()
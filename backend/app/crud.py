@@ -1,40 +1,106 @@
 ﻿from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable, List, Optional, Any
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from . import models, schemas
+from .audit import audit_buffer
+
+_UTC = timezone.utc
+_utcnow = models.utcnow
+
 
 UNSET = object()
 
+ITEM_ID_CHUNK_SIZE = 500
+ACTIVE_AGENT_STATUSES = ("queued", "running")
+
+# 加载选项在模块级构造一次，各调用点复用同一组对象，语句缓存键保持一致。
+_CLUSTER_OPTS = (selectinload(models.ClusterConfig.default_agent),)
+_CLUSTER_LIST_OPTS = _CLUSTER_OPTS + (raiseload("*"),)
+_AGENT_LIST_OPTS = (selectinload(models.InspectionAgent.cluster), raiseload("*"))
+_AGENT_RUN_OPTS = (
+    selectinload(models.InspectionRun.cluster),
+    selectinload(models.InspectionRun.results),
+    selectinload(models.InspectionRun.agent),
+    raiseload("*"),
+)
+_RUN_LIST_OPTS = (
+    joinedload(models.InspectionRun.cluster),
+    joinedload(models.InspectionRun.agent),
+    raiseload("*"),
+)
+# 多对一的集群、Agent 与巡检项随主查询 JOIN 取回；一对多的结果单独 SELECT IN，
+# 避免巡检记录行随结果数成倍展开。
+_RUN_DETAIL_OPTS = (
+    selectinload(models.InspectionRun.results).joinedload(
+        models.InspectionResult.item, innerjoin=False
+    ),
+    joinedload(models.InspectionRun.cluster),
+    joinedload(models.InspectionRun.agent),
+)
+
+
+@contextmanager
+def _transaction(db: Session) -> Iterator[None]:
+    """块结束时提交；出现异常则回滚，避免会话停留在失败的事务中。"""
+    try:
+        yield
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _commit_without_expire(db: Session) -> None:
+    """提交事务但不让会话中的对象过期。
+
+    新建记录的主键与默认值在 flush 时已写回对象，提交后无需再 refresh 查询一次。
+    """
+    previous = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = previous
+
+
+def _set_committed(obj: Any, values: dict) -> None:
+    # 同步已通过 UPDATE 语句写入的字段，不将对象标记为脏，也不触发重新查询。
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+
 
 def list_clusters(db: Session) -> List[models.ClusterConfig]:
     return (
         db.query(models.ClusterConfig)
-        .options(selectinload(models.ClusterConfig.default_agent))
+        .options(*_CLUSTER_LIST_OPTS)
         .order_by(models.ClusterConfig.name)
         .all()
     )
 
 
 def get_cluster(db: Session, cluster_id: int) -> Optional[models.ClusterConfig]:
-    return (
-        db.query(models.ClusterConfig)
-        .options(selectinload(models.ClusterConfig.default_agent))
-        .filter(models.ClusterConfig.id == cluster_id)
-        .first()
+    return db.get(
+        models.ClusterConfig,
+        cluster_id,
+        options=_CLUSTER_OPTS,
     )
 
 
 def get_cluster_by_name(db: Session, name: str) -> Optional[models.ClusterConfig]:
-    return (
-        db.query(models.ClusterConfig)
-        .options(selectinload(models.ClusterConfig.default_agent))
-        .filter(models.ClusterConfig.name == name)
-        .first()
+    stmt = (
+        select(models.ClusterConfig)
+        .options(*_CLUSTER_OPTS)
+        .where(models.ClusterConfig.name == name)
+        .limit(1)
     )
+    return db.execute(stmt).scalar_one_or_none()
 
 
 def create_cluster(
@@ -62,15 +128,15 @@ def create_cluster(
         default_agent_id=default_agent_id,
     )
     db.add(cluster)
-    db.commit()
-    db.refresh(cluster)
-    log_action(
+    db.flush()
+    _stage_audit(
         db,
         action="create",
         entity_type="cluster_config",
         entity_id=cluster.id,
         description=f"Registered cluster '{name}'.",
     )
+    _commit_without_expire(db)
     return cluster
 
 
@@ -106,17 +172,16 @@ def update_cluster(
         cluster.execution_mode = execution_mode
     if default_agent_id is not UNSET:
         cluster.default_agent_id = default_agent_id
-    cluster.updated_at = datetime.utcnow()
-    db.add(cluster)
-    db.commit()
+    cluster.updated_at = _utcnow()
+    with _transaction(db):
+        _stage_audit(
+            db,
+            action="update",
+            entity_type="cluster_config",
+            entity_id=cluster.id,
+            description=f"Updated cluster '{cluster.name}'.",
+        )
     db.refresh(cluster)
-    log_action(
-        db,
-        action="update",
-        entity_type="cluster_config",
-        entity_id=cluster.id,
-        description=f"Updated cluster '{cluster.name}'.",
-    )
     return cluster
 
 
@@ -124,17 +189,17 @@ def delete_cluster(db: Session, cluster: models.ClusterConfig) -> None:
     cluster_id = cluster.id
     cluster_name = cluster.name
     db.delete(cluster)
-    db.commit()
-    log_action(
+    _stage_audit(
         db,
         action="delete",
         entity_type="cluster_config",
         entity_id=cluster_id,
         description=f"Deleted cluster '{cluster_name}'.",
     )
+    db.commit()
 
 
-def log_action(
+def _stage_audit(
     db: Session,
     *,
     action: str,
@@ -142,6 +207,7 @@ def log_action(
     entity_id: Optional[int],
     description: Optional[str] = None,
 ) -> models.AuditLog:
+    """将审计日志加入当前会话，随调用方的事务一并提交。"""
     entry = models.AuditLog(
         action=action,
         entity_type=entity_type,
@@ -149,11 +215,25 @@ def log_action(
         description=description,
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
     return entry
 
 
+def log_action(
+    *,
+    action: str,
+    entity_type: str,
+    entity_id: Optional[int],
+    description: Optional[str] = None,
+) -> None:
+    """记录独立于任何会话事务的审计日志，由后台缓冲批量写入；需随事务提交或回滚的日志请用 _stage_audit。"""
+    audit_buffer.put(
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        description=description,
+    )
+
+
 def get_inspection_items(db: Session) -> List[models.InspectionItem]:
     return (
         db.query(models.InspectionItem)
@@ -164,11 +244,7 @@ def get_inspection_items(db: Session) -> List[models.InspectionItem]:
 
 
 def get_inspection_item(db: Session, item_id: int) -> Optional[models.InspectionItem]:
-    return (
-        db.query(models.InspectionItem)
-        .filter(models.InspectionItem.id == item_id)
-        .first()
-    )
+    return db.get(models.InspectionItem, item_id)
 
 
 def create_inspection_item(
@@ -179,15 +255,15 @@ def create_inspection_item(
     item = models.InspectionItem(**data)
     item.set_config(config if isinstance(config, dict) else None)
     db.add(item)
-    db.commit()
-    db.refresh(item)
-    log_action(
+    db.flush()
+    _stage_audit(
         db,
         action="create",
         entity_type="inspection_item",
         entity_id=item.id,
         description=f"Created inspection item '{item.name}'",
     )
+    _commit_without_expire(db)
     return item
 
 
@@ -203,56 +279,62 @@ def update_inspection_item(
     if config is not None:
         item.set_config(config if isinstance(config, dict) else None)
 
-    item.updated_at = datetime.utcnow()
-    db.add(item)
-    db.commit()
+    item.updated_at = _utcnow()
+    with _transaction(db):
+        _stage_audit(
+            db,
+            action="update",
+            entity_type="inspection_item",
+            entity_id=item.id,
+            description=f"Updated inspection item '{item.name}'",
+        )
     db.refresh(item)
-    log_action(
-        db,
-        action="update",
-        entity_type="inspection_item",
-        entity_id=item.id,
-        description=f"Updated inspection item '{item.name}'",
-    )
     return item
 
 
 def delete_inspection_item(db: Session, item: models.InspectionItem) -> None:
-    results = (
-        db.query(models.InspectionResult)
-        .filter(models.InspectionResult.item_id == item.id)
-        .all()
+    fallback_name = item.name or f"巡检项({item.id})"
+    db.query(models.InspectionResult).filter(
+        models.InspectionResult.item_id == item.id
+    ).update(
+        {
+            models.InspectionResult.item_name_cached: func.coalesce(
+                func.nullif(models.InspectionResult.item_name_cached, ""),
+                fallback_name,
+            ),
+            models.InspectionResult.item_id: None,
+        },
+        synchronize_session=False,
     )
-    for result in results:
-        if not result.item_name_cached:
-            result.item_name_cached = item.name or f"巡检项({item.id})"
-        result.item_id = None
-        db.add(result)
 
     item_id = item.id
     item_name = item.name
     db.delete(item)
-    db.commit()
-    log_action(
+    _stage_audit(
         db,
         action="delete",
         entity_type="inspection_item",
         entity_id=item_id,
         description=f"Deleted inspection item '{item_name}'",
     )
+    db.commit()
 
 
 def get_items_by_ids(
-    db: Session, item_ids: Iterable[int]
+    db: Session, item_ids: Iterable[int], *, preserve_order: bool = True
 ) -> List[models.InspectionItem]:
-    ids = list(dict.fromkeys(item_ids))
+    # 不要求顺序时直接用 set 去重，省去按输入顺序建 dict 的开销。
+    ids = list(dict.fromkeys(item_ids)) if preserve_order else list(set(item_ids))
     if not ids:
         return []
-    items = (
-        db.query(models.InspectionItem)
-        .filter(models.InspectionItem.id.in_(ids))
-        .all()
-    )
+    items: List[models.InspectionItem] = []
+    # 分批查询，避免 IN 参数超过数据库上限（如 SQLite 的 999 个）。
+    for start in range(0, len(ids), ITEM_ID_CHUNK_SIZE):
+        chunk = ids[start : start + ITEM_ID_CHUNK_SIZE]
+        stmt = select(models.InspectionItem).where(models.InspectionItem.id.in_(chunk))
+        items.extend(db.execute(stmt).scalars())
+    if not preserve_order:
+        return items
     item_map = {item.id: item for item in items}
     return [item_map[item_id] for item_id in ids if item_id in item_map]
 
@@ -282,15 +364,15 @@ def create_inspection_run(
         agent_id=agent_id,
     )
     db.add(run)
-    db.commit()
-    db.refresh(run)
-    log_action(
+    db.flush()
+    _stage_audit(
         db,
         action="create",
         entity_type="inspection_run",
         entity_id=run.id,
         description=f"Created inspection run (status={status})",
     )
+    _commit_without_expire(db)
     return run
 
 
@@ -313,17 +395,17 @@ def finalize_inspection_run(
     if run.total_items:
         processed = min(max(processed, run.total_items), run.total_items)
     run.processed_items = max(processed, run.processed_items or 0)
-    run.completed_at = datetime.utcnow()
+    run.completed_at = _utcnow()
     db.add(run)
-    db.commit()
-    db.refresh(run)
-    log_action(
+    _stage_audit(
         db,
         action="update",
         entity_type="inspection_run",
         entity_id=run.id,
         description=f"Run finalized with status={status}",
     )
+    db.commit()
+    db.refresh(run)
     return run
 
 
@@ -335,7 +417,13 @@ def add_inspection_result(
     status: str,
     detail: Optional[str],
     suggestion: Optional[str],
+    commit: bool = True,
 ) -> models.InspectionResult:
+    """记录单条巡检结果。
+
+    commit=False 用于逐项执行的巡检：结果只加入会话、不单独写审计日志，由调用方随进度更新
+    一并提交，并在巡检结束时按整次巡检记录一条审计日志。
+    """
     item_id = item.id if item else None
     item_name = ""
     if item:
@@ -351,46 +439,92 @@ def add_inspection_result(
         item_name_cached=item_name,
     )
     db.add(result)
-    db.commit()
-    db.refresh(result)
-    log_action(
+    if not commit:
+        return result
+    db.flush()
+    _stage_audit(
         db,
         action="create",
         entity_type="inspection_result",
         entity_id=result.id,
         description=f"Recorded result for item '{item_name}' with status={status}",
     )
+    _commit_without_expire(db)
     return result
 
 
+def bulk_add_inspection_results(
+    db: Session,
+    *,
+    run: models.InspectionRun,
+    results: Iterable[dict],
+) -> int:
+    """批量写入巡检结果，results 中每项包含 item_id/status/detail/suggestion。"""
+    entries = list(results)
+    if not entries:
+        return 0
+    item_ids = [entry["item_id"] for entry in entries if entry.get("item_id") is not None]
+    item_map = {
+        item.id: item for item in get_items_by_ids(db, item_ids, preserve_order=False)
+    }
+    rows = []
+    for entry in entries:
+        item = item_map.get(entry.get("item_id"))
+        rows.append(
+            {
+                "run_id": run.id,
+                "item_id": item.id if item else None,
+                "status": entry.get("status"),
+                "detail": entry.get("detail"),
+                "suggestion": entry.get("suggestion"),
+                "item_name_cached": (
+                    (item.name or f"巡检项({item.id})") if item else "巡检项"
+                ),
+            }
+        )
+    db.bulk_insert_mappings(models.InspectionResult, rows)
+    _stage_audit(
+        db,
+        action="update",
+        entity_type="inspection_run",
+        entity_id=run.id,
+        description=f"Recorded {len(rows)} results for run {run.id}",
+    )
+    db.commit()
+    return len(rows)
+
+
 def update_inspection_run_progress(
     db: Session,
     *,
     run: models.InspectionRun,
     processed_items: int,
 ) -> models.InspectionRun:
-    run.processed_items = max(0, min(processed_items, run.total_items or processed_items))
-    db.add(run)
-    db.commit()
-    db.refresh(run)
+    values = {
+        "processed_items": max(0, min(processed_items, run.total_items or processed_items))
+    }
+    db.execute(
+        update(models.InspectionRun)
+        .where(models.InspectionRun.id == run.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    _commit_without_expire(db)
+    _set_committed(run, values)
     return run
 
 
 def list_inspection_agents(db: Session) -> List[models.InspectionAgent]:
     return (
         db.query(models.InspectionAgent)
-        .options(selectinload(models.InspectionAgent.cluster))
+        .options(*_AGENT_LIST_OPTS)
         .order_by(models.InspectionAgent.created_at.desc())
         .all()
     )
 
 
 def get_inspection_agent(db: Session, agent_id: int) -> Optional[models.InspectionAgent]:
-    return (
-        db.query(models.InspectionAgent)
-        .filter(models.InspectionAgent.id == agent_id)
-        .first()
-    )
+    return db.get(models.InspectionAgent, agent_id)
 
 
 def get_inspection_agent_by_token(db: Session, token: str) -> Optional[models.InspectionAgent]:
@@ -420,15 +554,15 @@ def create_inspection_agent(
         prometheus_url=prometheus_url,
     )
     db.add(agent)
-    db.commit()
-    db.refresh(agent)
-    log_action(
+    db.flush()
+    _stage_audit(
         db,
         action="create",
         entity_type="inspection_agent",
         entity_id=agent.id,
         description=f"创建巡检 Agent '{agent.name}'",
     )
+    _commit_without_expire(db)
     return agent
 
 
@@ -452,17 +586,16 @@ def update_inspection_agent(
         agent.cluster_id = cluster.id if isinstance(cluster, models.ClusterConfig) else None
     if prometheus_url is not UNSET:
         agent.prometheus_url = prometheus_url
-    agent.updated_at = datetime.utcnow()
-    db.add(agent)
-    db.commit()
+    agent.updated_at = _utcnow()
+    with _transaction(db):
+        _stage_audit(
+            db,
+            action="update",
+            entity_type="inspection_agent",
+            entity_id=agent.id,
+            description=f"更新巡检 Agent '{agent.name}'",
+        )
     db.refresh(agent)
-    log_action(
-        db,
-        action="update",
-        entity_type="inspection_agent",
-        entity_id=agent.id,
-        description=f"更新巡检 Agent '{agent.name}'",
-    )
     return agent
 
 
@@ -472,11 +605,20 @@ def record_agent_heartbeat(
     *,
     seen_at: Optional[datetime] = None,
 ) -> models.InspectionAgent:
-    agent.last_seen_at = seen_at or datetime.utcnow()
-    agent.updated_at = datetime.utcnow()
-    db.add(agent)
-    db.commit()
-    db.refresh(agent)
+    now = _utcnow()
+    if seen_at is None:
+        seen_at = now
+    elif seen_at.tzinfo is not None:
+        seen_at = seen_at.astimezone(_UTC).replace(tzinfo=None)
+    values = {"last_seen_at": seen_at, "updated_at": now}
+    db.execute(
+        update(models.InspectionAgent)
+        .where(models.InspectionAgent.id == agent.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    _commit_without_expire(db)
+    _set_committed(agent, values)
     return agent
 
 
@@ -484,20 +626,18 @@ def list_agent_runs(
     db: Session,
     *,
     agent: models.InspectionAgent,
-    statuses: Iterable[str] = ("queued", "running"),
+    statuses: Iterable[str] = ACTIVE_AGENT_STATUSES,
     limit: int = 10,
 ) -> List[models.InspectionRun]:
+    if not isinstance(statuses, tuple):
+        statuses = tuple(statuses)
     return (
         db.query(models.InspectionRun)
-        .options(
-            selectinload(models.InspectionRun.cluster),
-            selectinload(models.InspectionRun.results),
-            selectinload(models.InspectionRun.agent),
-        )
+        .options(*_AGENT_RUN_OPTS)
         .filter(
             models.InspectionRun.agent_id == agent.id,
             models.InspectionRun.executor == "agent",
-            models.InspectionRun.agent_status.in_(tuple(statuses)),
+            models.InspectionRun.agent_status.in_(statuses),
         )
         .order_by(models.InspectionRun.created_at.asc())
         .limit(limit)
@@ -526,35 +666,12 @@ def update_inspection_run_agent_state(
 
 
 def delete_run_results(db: Session, run: models.InspectionRun) -> None:
-    db.query(models.InspectionResult).filter(
-        models.InspectionResult.run_id == run.id
-    ).delete()
-    db.commit()
-
-
-def add_run_result_by_item_id(
-    db: Session,
-    run: models.InspectionRun,
-    item_id: Optional[int],
-    status: str,
-    detail: Optional[str],
-    suggestion: Optional[str],
-) -> models.InspectionResult:
-    item = None
-    if item_id is not None:
-        item = (
-            db.query(models.InspectionItem)
-            .filter(models.InspectionItem.id == item_id)
-            .first()
-        )
-    return add_inspection_result(
-        db,
-        run=run,
-        item=item,
-        status=status,
-        detail=detail,
-        suggestion=suggestion,
+    db.execute(
+        delete(models.InspectionResult)
+        .where(models.InspectionResult.run_id == run.id)
+        .execution_options(synchronize_session=False)
     )
+    db.commit()
 
 
 def pause_inspection_run(
@@ -563,15 +680,15 @@ def pause_inspection_run(
 ) -> models.InspectionRun:
     run.status = "paused"
     db.add(run)
-    db.commit()
-    db.refresh(run)
-    log_action(
+    _stage_audit(
         db,
         action="update",
         entity_type="inspection_run",
         entity_id=run.id,
         description="Paused inspection run.",
     )
+    db.commit()
+    db.refresh(run)
     return run
 
 
@@ -582,15 +699,15 @@ def resume_inspection_run(
     run.status = "running"
     run.completed_at = None
     db.add(run)
-    db.commit()
-    db.refresh(run)
-    log_action(
+    _stage_audit(
         db,
         action="update",
         entity_type="inspection_run",
         entity_id=run.id,
         description="Resumed inspection run.",
     )
+    db.commit()
+    db.refresh(run)
     return run
 
 
@@ -602,69 +719,113 @@ def cancel_inspection_run(
     run.status = "cancelled"
     if run.executor == "agent":
         run.agent_status = "failed"
-    run.completed_at = datetime.utcnow()
+    run.completed_at = _utcnow()
     if reason:
         run.summary = reason[:500]
     elif not run.summary:
         run.summary = "巡检已取消"
     db.add(run)
-    db.commit()
-    db.refresh(run)
-    log_action(
+    _stage_audit(
         db,
         action="update",
         entity_type="inspection_run",
         entity_id=run.id,
         description="Cancelled inspection run.",
     )
+    db.commit()
+    db.refresh(run)
     return run
 
 
-def list_inspection_runs(db: Session) -> List[models.InspectionRun]:
-    return (
-        db.query(models.InspectionRun)
-        .options(
-            selectinload(models.InspectionRun.cluster),
-            selectinload(models.InspectionRun.agent),
+def _apply_keyset(query, model, before: Optional[datetime], before_id: Optional[int]):
+    """按 (created_at, id) 倒序做键集分页，before/before_id 为上一页最后一条记录。"""
+    if before is not None:
+        if before_id is None:
+            query = query.filter(model.created_at < before)
+        else:
+            query = query.filter(
+                or_(
+                    model.created_at < before,
+                    and_(model.created_at == before, model.id < before_id),
+                )
+            )
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def list_inspection_runs(
+    db: Session,
+    *,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = 100,
+) -> List[models.InspectionRun]:
+    """按创建时间倒序分页读取巡检记录；limit 为 None 时返回游标之后的全部记录。"""
+    query = db.query(models.InspectionRun).options(*_RUN_LIST_OPTS)
+    query = _apply_keyset(query, models.InspectionRun, before, before_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def get_run_cluster_sequences(
+    db: Session, runs: List[models.InspectionRun]
+) -> Dict[int, int]:
+    """返回一页巡检记录在各自集群内按创建时间排列的序号（从 1 开始），用于生成巡检编号。
+
+    runs 须为 list_inspection_runs 返回的连续一页：同集群中比本页最后一条更晚的记录都在本页内，
+    只需再按集群统计更早的记录数。
+    """
+    if not runs:
+        return {}
+    model = models.InspectionRun
+    oldest = runs[-1]
+    rows = db.execute(
+        select(model.cluster_id, func.count(model.id))
+        .where(
+            model.cluster_id.in_({run.cluster_id for run in runs}),
+            or_(
+                model.created_at < oldest.created_at,
+                and_(model.created_at == oldest.created_at, model.id < oldest.id),
+            ),
         )
-        .order_by(models.InspectionRun.created_at.desc())
-        .all()
+        .group_by(model.cluster_id)
     )
+    positions: Dict[int, int] = dict(rows.all())
+    sequences: Dict[int, int] = {}
+    for run in reversed(runs):
+        positions[run.cluster_id] = positions.get(run.cluster_id, 0) + 1
+        sequences[run.id] = positions[run.cluster_id]
+    return sequences
 
 
 def get_inspection_run(db: Session, run_id: int) -> Optional[models.InspectionRun]:
-    return (
-        db.query(models.InspectionRun)
-        .options(
-            selectinload(models.InspectionRun.results).selectinload(
-                models.InspectionResult.item
-            ),
-            selectinload(models.InspectionRun.cluster),
-            selectinload(models.InspectionRun.agent),
-        )
-        .filter(models.InspectionRun.id == run_id)
-        .first()
+    return db.get(
+        models.InspectionRun,
+        run_id,
+        options=_RUN_DETAIL_OPTS,
     )
 
 
 def delete_inspection_run(db: Session, run: models.InspectionRun) -> None:
     run_id = run.id
     db.delete(run)
-    db.commit()
-    log_action(
+    _stage_audit(
         db,
         action="delete",
         entity_type="inspection_run",
         entity_id=run_id,
         description=f"Deleted inspection run {run_id}.",
     )
+    db.commit()
 
 
-def list_audit_logs(db: Session, limit: int = 100) -> List[models.AuditLog]:
-    return (
-        db.query(models.AuditLog)
-        .order_by(models.AuditLog.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-
+def list_audit_logs(
+    db: Session,
+    limit: int = 100,
+    *,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+) -> List[models.AuditLog]:
+    # 只读查询不触发缓冲写入；log_action 记录的日志最多延迟一个刷新周期后可见。
+    query = _apply_keyset(db.query(models.AuditLog), models.AuditLog, before, before_id)
+    return query.limit(limit).all()
@@ -1,12 +1,20 @@
 ﻿from __future__ import annotations
 
+import logging
 import os
+import threading
 from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Callable, Optional, Sequence
 from urllib.parse import quote_plus
 
-from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy import Index, bindparam, create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, Inspector
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.sql.elements import TextClause
 
 from .license import ensure_license_directory
 
@@ -18,6 +26,98 @@ MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
 MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
 
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    """读取整数环境变量；未设置或格式错误时使用默认值，格式错误时记录警告。"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("环境变量 %s=%r 不是整数，使用默认值 %s", name, raw, default)
+        return default
+
+
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 20)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+# 只读引擎单独建池，默认小于读写池；两个池合计的连接上限为 (DB_POOL_SIZE + DB_MAX_OVERFLOW) + (DB_READ_POOL_SIZE + DB_READ_MAX_OVERFLOW)。
+DB_READ_POOL_SIZE = _env_int("DB_READ_POOL_SIZE", 10)
+DB_READ_MAX_OVERFLOW = _env_int("DB_READ_MAX_OVERFLOW", 10)
+DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "true").strip().lower() in {"1", "true", "yes", "on"}
+
+# 表结构补丁版本号：修改 _plan_* 补丁或模型索引后需要递增，已是最新版本的库启动时跳过全部补丁。
+CURRENT_SCHEMA_VERSION = 1
+
+MYSQL_COLLATION = "utf8mb4_unicode_ci"
+CONVERT_CLAUSE = f"CONVERT TO CHARACTER SET utf8mb4 COLLATE {MYSQL_COLLATION}"
+BACKFILL_BATCH_SIZE = 10000
+RUNTIME_SUBDIRECTORIES = ("reports", "configs", "state")
+PATCHED_TABLES = (
+    "cluster_configs",
+    "inspection_items",
+    "inspection_runs",
+    "inspection_results",
+    "audit_logs",
+    "inspection_agents",
+)
+ONLINE_DDL_OPTIONS = "ALGORITHM=INPLACE, LOCK=NONE"
+COPY_DDL_OPTIONS = "ALGORITHM=COPY, LOCK=SHARED"
+# ER_ALTER_OPERATION_NOT_SUPPORTED / ER_ALTER_OPERATION_NOT_SUPPORTED_REASON
+_ONLINE_DDL_UNSUPPORTED = {1845, 1846}
+
+# 表结构补丁完成后置位；补丁在后台执行期间，依赖新列的接口应暂不提供服务。
+schema_ready = threading.Event()
+# 补丁完成前将被补丁改动（加列、重建、ALTER、改写数据或补建索引）的表；只有读写这些表的接口需要等待补丁完成。
+schema_pending_tables: set[str] = set()
+
+SchemaPatch = tuple[str, Callable[[], None]]
+
+# 启动补丁中固定不变的 SQL，在导入时构造一次。
+_CREATE_SCHEMA_VERSION_SQL: TextClause = text(
+    "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY)"
+)
+_SELECT_SCHEMA_VERSION_SQL: TextClause = text("SELECT MAX(version) FROM schema_version")
+_CLEAR_SCHEMA_VERSION_SQL: TextClause = text("DELETE FROM schema_version")
+_INSERT_SCHEMA_VERSION_SQL: TextClause = text(
+    "INSERT INTO schema_version (version) VALUES (:version)"
+)
+_MYSQL_TABLE_COLLATIONS_SQL: TextClause = text(
+    "SELECT TABLE_NAME, TABLE_COLLATION FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE()"
+)
+_MYSQL_COLUMN_COLLATIONS_SQL: TextClause = text(
+    "SELECT TABLE_NAME, COLUMN_NAME, COLLATION_NAME FROM information_schema.COLUMNS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND COLLATION_NAME IS NOT NULL"
+)
+_MYSQL_TABLE_COLUMNS_SQL: TextClause = text(
+    "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN :tables"
+).bindparams(bindparam("tables", expanding=True))
+_RESULT_ID_BOUNDS_SQL: TextClause = text("SELECT MIN(id), MAX(id) FROM inspection_results")
+_MYSQL_BACKFILL_ITEM_NAME_SQL: TextClause = text(
+    "UPDATE inspection_results r "
+    "JOIN inspection_items i ON r.item_id = i.id "
+    "SET r.item_name_cached = i.name "
+    "WHERE r.id BETWEEN :start AND :end "
+    "AND (r.item_name_cached IS NULL OR r.item_name_cached = '')"
+)
+_SQLITE_ADD_ITEM_NAME_SQL: TextClause = text(
+    "ALTER TABLE inspection_results ADD COLUMN item_name_cached TEXT NOT NULL DEFAULT ''"
+)
+_SQLITE_BACKFILL_ITEM_NAME_SQL: TextClause = text(
+    "UPDATE inspection_results SET item_name_cached = ("
+    "SELECT i.name FROM inspection_items AS i "
+    "WHERE i.id = inspection_results.item_id) "
+    "WHERE item_id IS NOT NULL AND EXISTS ("
+    "SELECT 1 FROM inspection_items AS i "
+    "WHERE i.id = inspection_results.item_id)"
+)
+
 if all([MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE]):
     encoded_password = quote_plus(MYSQL_PASSWORD)
     DATABASE_URL = (
@@ -27,49 +127,99 @@ if all([MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE]):
 else:
     DATABASE_URL = DEFAULT_DATABASE_URL
 
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL 让读写互不阻塞，synchronous=NORMAL 在 WAL 下仍可保证一致性且减少 fsync。
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    finally:
+        cursor.close()
+
+
+@lru_cache(maxsize=2)
+def get_engine(readonly: bool = False) -> Engine:
+    """进程内的数据库引擎，读写与只读各创建一次。
+
+    只读引擎使用 AUTOCOMMIT 且归还连接时不做 reset，省去每次关闭会话时的 ROLLBACK 往返；
+    MySQL 下其连接池按 DB_READ_POOL_SIZE / DB_READ_MAX_OVERFLOW 单独计算。
+    """
+    readonly_options = (
+        {"isolation_level": "AUTOCOMMIT", "pool_reset_on_return": None}
+        if readonly
+        else {}
     )
-else:
-    engine = create_engine(
+    if DATABASE_URL.startswith("sqlite"):
+        sqlite_engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            **readonly_options,
+        )
+        event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+        return sqlite_engine
+
+    # 字符集由 charset 参数在握手时确定，排序规则由 init_command 在建连时设置，
+    # 不再在 connect 事件里额外执行 SET 语句。
+    return create_engine(
         DATABASE_URL,
+        pool_size=DB_READ_POOL_SIZE if readonly else DB_POOL_SIZE,
+        max_overflow=DB_READ_MAX_OVERFLOW if readonly else DB_MAX_OVERFLOW,
         pool_pre_ping=True,
-        pool_recycle=1800,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_use_lifo=DB_POOL_USE_LIFO,
         connect_args={
             "charset": "utf8mb4",
             "use_unicode": True,
             "init_command": "SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci",
         },
+        **readonly_options,
     )
 
-    @event.listens_for(engine, "connect")
-    def _set_mysql_charset(dbapi_connection, connection_record) -> None:
-        cursor = dbapi_connection.cursor()
-        try:
-            cursor.execute("SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci")
-            cursor.execute("SET CHARACTER SET utf8mb4")
-            cursor.execute("SET character_set_connection=utf8mb4")
-        finally:
-            cursor.close()
+
+engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+read_engine = get_engine(readonly=True)
+ReadOnlySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
 
 def init_db() -> None:
     """Create database tables if they do not exist."""
+    if not init_db_fast():
+        upgrade_schema()
+
+
+def init_db_fast() -> bool:
+    """只建表并检查补丁版本；返回 True 表示表结构已是最新，无需再执行 upgrade_schema。"""
     # Late import to avoid circular dependency
     from . import models  # noqa: F401
 
+    fresh = not inspect(engine).get_table_names()
     Base.metadata.create_all(bind=engine)
-    _ensure_cluster_schema()
-    _ensure_inspection_schema()
-    _ensure_inspection_runs_schema()
-    _ensure_inspection_results_schema()
-    _ensure_audit_log_schema()
-    _ensure_inspection_agents_schema()
+    version = _read_schema_version()
+    if fresh:
+        # 新库由 create_all 直接建出最新结构，记录版本即可。
+        _write_schema_version(CURRENT_SCHEMA_VERSION)
+        version = CURRENT_SCHEMA_VERSION
+    if version >= CURRENT_SCHEMA_VERSION:
+        schema_ready.set()
+        return True
+    schema_pending_tables.update(table for table, _ in _plan_schema_patches())
+    return False
+
+
+def upgrade_schema() -> None:
+    """执行全部表结构补丁，可在后台线程中调用。"""
+    for _, patch in _plan_schema_patches():
+        patch()
+    _write_schema_version(CURRENT_SCHEMA_VERSION)
+    schema_pending_tables.clear()
+    schema_ready.set()
 
 
 @contextmanager
@@ -82,229 +232,325 @@ def get_session() -> Session:
         db.close()
 
 
+@contextmanager
+def get_readonly_session() -> Session:
+    """Yield a read-only (autocommit) session; do not use it for writes."""
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def ensure_runtime_directories() -> None:
     """Ensure directories for storing generated assets exist."""
     base = Path("data")
-    (base / "reports").mkdir(parents=True, exist_ok=True)
-    (base / "configs").mkdir(parents=True, exist_ok=True)
-    (base / "state").mkdir(parents=True, exist_ok=True)
+    # 先列一次 data 目录，重启时子目录通常都已存在，不再逐个 mkdir。
+    try:
+        with os.scandir(base) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        existing = set()
+    for name in RUNTIME_SUBDIRECTORIES:
+        if name not in existing:
+            os.makedirs(base / name, exist_ok=True)
     ensure_license_directory()
 
 
-def _ensure_cluster_schema() -> None:
-    """Ensure new cluster columns exist without requiring manual migration."""
+def _read_schema_version() -> int:
+    with engine.begin() as connection:
+        connection.execute(_CREATE_SCHEMA_VERSION_SQL)
+        version = connection.execute(_SELECT_SCHEMA_VERSION_SQL).scalar()
+    return version or 0
+
+
+def _write_schema_version(version: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(_CLEAR_SCHEMA_VERSION_SQL)
+        connection.execute(_INSERT_SCHEMA_VERSION_SQL, {"version": version})
+
+
+def _load_table_columns(inspector: Inspector) -> dict[str, set[str]]:
+    """返回补丁涉及各表的现有列名；MySQL 用一次 information_schema 查询取回全部表。"""
+    if engine.dialect.name == "sqlite":
+        existing_tables = set(inspector.get_table_names())
+        return {
+            table: {column["name"] for column in inspector.get_columns(table)}
+            for table in PATCHED_TABLES
+            if table in existing_tables
+        }
+    table_columns: dict[str, set[str]] = {}
+    with engine.connect() as connection:
+        for table, column in connection.execute(
+            _MYSQL_TABLE_COLUMNS_SQL, {"tables": list(PATCHED_TABLES)}
+        ):
+            table_columns.setdefault(table, set()).add(column)
+    return table_columns
+
+
+@dataclass
+class _Collations:
+    """MySQL 当前库中各表及各文本列的排序规则，用于跳过已是 utf8mb4 的字符集转换。"""
+
+    tables: dict[str, str] = field(default_factory=dict)
+    columns: dict[tuple[str, str], str] = field(default_factory=dict)
+
+    def charset_clauses(self, table: str, modifies: dict[str, str]) -> list[str]:
+        """返回仍需执行的 CONVERT / MODIFY 子句；modifies 为 {列名: MODIFY 子句}。"""
+        clauses: list[str] = []
+        # 表默认排序规则已正确时，仍可能有旧列保留其他排序规则；没有对应 MODIFY 子句的列只能靠 CONVERT 修复。
+        stale_columns = any(
+            name == table and column not in modifies and collation != MYSQL_COLLATION
+            for (name, column), collation in self.columns.items()
+        )
+        if self.tables.get(table) != MYSQL_COLLATION or stale_columns:
+            clauses.append(CONVERT_CLAUSE)
+        for column, clause in modifies.items():
+            collation = self.columns.get((table, column))
+            # 不在 information_schema 中的列（本次新增）不能在同一条 ALTER 里 MODIFY。
+            if collation is not None and collation != MYSQL_COLLATION:
+                clauses.append(clause)
+        return clauses
+
+
+def _load_mysql_collations() -> _Collations:
+    collations = _Collations()
+    if engine.dialect.name == "sqlite":
+        return collations
+    with engine.connect() as connection:
+        for name, collation in connection.execute(_MYSQL_TABLE_COLLATIONS_SQL):
+            collations.tables[name] = collation
+        for name, column, collation in connection.execute(_MYSQL_COLUMN_COLLATIONS_SQL):
+            collations.columns[(name, column)] = collation
+    return collations
+
+
+def _plan_schema_patches() -> list[SchemaPatch]:
+    """只读检查现有表结构，按执行顺序返回仍需执行的补丁 [(表名, 补丁)]。"""
+    # 只建一次 Inspector：其自带的 info_cache 会缓存各表的列/外键查询结果，
+    # 避免每个补丁函数重复查询 information_schema。
     inspector = inspect(engine)
-    if "cluster_configs" not in inspector.get_table_names():
+    table_columns = _load_table_columns(inspector)
+    collations = _load_mysql_collations()
+    planned = (
+        ("cluster_configs", _plan_cluster_schema(inspector, table_columns, collations)),
+        ("inspection_items", _plan_inspection_schema(inspector, table_columns, collations)),
+        ("inspection_runs", _plan_inspection_runs_schema(inspector, table_columns, collations)),
+        ("inspection_results", _plan_inspection_results_schema(inspector, table_columns, collations)),
+        ("audit_logs", _plan_audit_log_schema(inspector, table_columns, collations)),
+        ("inspection_agents", _plan_inspection_agents_schema(inspector, table_columns)),
+    )
+    patches = [(table, patch) for table, patch in planned if patch is not None]
+    patches.extend(_plan_indexes(inspector, {table for table, _ in patches}))
+    return patches
+
+
+def _apply_table_changes(table: str, clauses: list[str], statements: Sequence[str] = ()) -> None:
+    """在同一事务中执行一张表的 ALTER 子句及后续语句。"""
+    with engine.begin() as connection:
+        _alter_table(connection, table, clauses)
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def _alter_table(connection, table: str, clauses: list[str]) -> None:
+    """MySQL 下把同一张表的多个变更合并为一条 ALTER，只重建一次表；SQLite 不支持多子句，逐条执行。"""
+    if not clauses:
+        return
+    if engine.dialect.name == "sqlite":
+        for clause in clauses:
+            connection.execute(text(f"ALTER TABLE {table} {clause}"))
         return
+    statement = f"ALTER TABLE {table} " + ", ".join(clauses)
+    # 字符集转换必然拷贝整表，无需尝试在线 DDL。
+    if CONVERT_CLAUSE in clauses:
+        connection.execute(text(statement))
+        return
+    try:
+        connection.execute(text(f"{statement}, {ONLINE_DDL_OPTIONS}"))
+    except OperationalError as exc:
+        code = exc.orig.args[0] if exc.orig is not None and exc.orig.args else None
+        if code not in _ONLINE_DDL_UNSUPPORTED:
+            raise
+        logger.info("表 %s 的变更不支持在线 DDL，改用 COPY 方式执行", table)
+        connection.execute(text(f"{statement}, {COPY_DDL_OPTIONS}"))
+
+
+def _rename_values_statement(table: str, renames: dict[str, dict[str, str]]) -> str:
+    """把多列的旧值改写合并为一条 UPDATE，只扫描一次表；renames 为 {列名: {旧值: 新值}}。"""
+    assignments: list[str] = []
+    conditions: list[str] = []
+    for column, mapping in renames.items():
+        cases = " ".join(f"WHEN '{old}' THEN '{new}'" for old, new in mapping.items())
+        olds = ", ".join(f"'{old}'" for old in mapping)
+        assignments.append(f"{column} = CASE {column} {cases} ELSE {column} END")
+        conditions.append(f"{column} IN ({olds})")
+    return (
+        f"UPDATE {table} SET {', '.join(assignments)} "
+        f"WHERE {' OR '.join(conditions)}"
+    )
 
-    existing_columns = {
-        column["name"] for column in inspector.get_columns("cluster_configs")
-    }
 
-    statements = []
+def _plan_cluster_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]], collations: _Collations
+) -> Optional[Callable[[], None]]:
+    """Ensure new cluster columns exist without requiring manual migration."""
+    if "cluster_configs" not in table_columns:
+        return None
+
+    existing_columns = table_columns["cluster_configs"]
+
+    clauses: list[str] = []
     dialect = engine.dialect.name
 
     if "connection_status" not in existing_columns:
         if dialect == "sqlite":
-            statements.append(
-                "ALTER TABLE cluster_configs "
-                "ADD COLUMN connection_status TEXT DEFAULT 'unknown'"
-            )
+            clauses.append("ADD COLUMN connection_status TEXT DEFAULT 'unknown'")
         else:
-            statements.append(
-                "ALTER TABLE cluster_configs "
+            clauses.append(
                 "ADD COLUMN connection_status VARCHAR(20) NOT NULL DEFAULT 'unknown'"
             )
 
     if "connection_message" not in existing_columns:
         column_type = "TEXT" if dialect == "sqlite" else "TEXT"
-        statements.append(
-            f"ALTER TABLE cluster_configs ADD COLUMN connection_message {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN connection_message {column_type} NULL")
 
     if "last_checked_at" not in existing_columns:
         if dialect == "sqlite":
-            statements.append(
-                "ALTER TABLE cluster_configs ADD COLUMN last_checked_at TEXT NULL"
-            )
+            clauses.append("ADD COLUMN last_checked_at TEXT NULL")
         else:
-            statements.append(
-                "ALTER TABLE cluster_configs ADD COLUMN last_checked_at DATETIME NULL"
-            )
+            clauses.append("ADD COLUMN last_checked_at DATETIME NULL")
 
     if "execution_mode" not in existing_columns:
         column_type = "TEXT" if dialect == "sqlite" else "VARCHAR(20)"
-        statements.append(
-            f"ALTER TABLE cluster_configs ADD COLUMN execution_mode {column_type} NOT NULL DEFAULT 'server'"
+        clauses.append(
+            f"ADD COLUMN execution_mode {column_type} NOT NULL DEFAULT 'server'"
         )
 
     if "default_agent_id" not in existing_columns:
         column_type = "INTEGER" if dialect == "sqlite" else "INT"
-        statements.append(
-            f"ALTER TABLE cluster_configs ADD COLUMN default_agent_id {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN default_agent_id {column_type} NULL")
 
     if dialect != "sqlite":
-        statements.append(
-            "ALTER TABLE cluster_configs CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
-        )
-
-    if not statements:
-        return
+        clauses.extend(collations.charset_clauses("cluster_configs", {}))
 
-    with engine.begin() as connection:
-        for statement in statements:
-            connection.execute(text(statement))
+    if not clauses:
+        return None
+    return partial(_apply_table_changes, "cluster_configs", clauses)
 
 
-def _ensure_inspection_schema() -> None:
-    inspector = inspect(engine)
-    if "inspection_items" not in inspector.get_table_names():
-        return
+def _plan_inspection_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]], collations: _Collations
+) -> Optional[Callable[[], None]]:
+    if "inspection_items" not in table_columns:
+        return None
 
-    existing_columns = {column["name"] for column in inspector.get_columns("inspection_items")}
+    existing_columns = table_columns["inspection_items"]
     dialect = engine.dialect.name
-    statements: list[str] = []
+    clauses: list[str] = []
 
     if "config_json" not in existing_columns:
         column_type = "TEXT"
-        statements.append(
-            f"ALTER TABLE inspection_items ADD COLUMN config_json {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN config_json {column_type} NULL")
 
     if "is_archived" not in existing_columns:
         if dialect == "sqlite":
-            statements.append(
-                "ALTER TABLE inspection_items ADD COLUMN is_archived INTEGER NOT NULL DEFAULT 0"
-            )
+            clauses.append("ADD COLUMN is_archived INTEGER NOT NULL DEFAULT 0")
         else:
-            statements.append(
-                "ALTER TABLE inspection_items ADD COLUMN is_archived TINYINT(1) NOT NULL DEFAULT 0"
-            )
+            clauses.append("ADD COLUMN is_archived TINYINT(1) NOT NULL DEFAULT 0")
 
     if dialect != "sqlite":
-        statements.extend(
-            [
-                "ALTER TABLE inspection_items CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci",
-                "ALTER TABLE inspection_items MODIFY name VARCHAR(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
-                "ALTER TABLE inspection_items MODIFY description TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL",
-                "ALTER TABLE inspection_items MODIFY check_type VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
-            ]
-        )
-        if "config_json" in existing_columns:
-            statements.append(
-                "ALTER TABLE inspection_items MODIFY config_json TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL"
+        clauses.extend(
+            collations.charset_clauses(
+                "inspection_items",
+                {
+                    "name": "MODIFY name VARCHAR(100) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
+                    "description": "MODIFY description TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL",
+                    "check_type": "MODIFY check_type VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
+                    "config_json": "MODIFY config_json TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL",
+                },
             )
-        statements.append(
-            "ALTER TABLE inspection_items MODIFY is_archived TINYINT(1) NOT NULL DEFAULT 0"
         )
+        # 合并到同一条 ALTER 后，不能再 MODIFY 本次刚新增的列。
+        if "is_archived" in existing_columns:
+            clauses.append("MODIFY is_archived TINYINT(1) NOT NULL DEFAULT 0")
 
-    if not statements:
-        return
-
-    with engine.begin() as connection:
-        for statement in statements:
-            connection.execute(text(statement))
+    if not clauses:
+        return None
+    return partial(_apply_table_changes, "inspection_items", clauses)
 
 
-def _ensure_inspection_runs_schema() -> None:
-    inspector = inspect(engine)
-    if "inspection_runs" not in inspector.get_table_names():
-        return
+def _plan_inspection_runs_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]], collations: _Collations
+) -> Optional[Callable[[], None]]:
+    if "inspection_runs" not in table_columns:
+        return None
 
-    existing_columns = {
-        column["name"] for column in inspector.get_columns("inspection_runs")
-    }
+    existing_columns = table_columns["inspection_runs"]
     dialect = engine.dialect.name
-    statements: list[str] = []
-    updates: list[str] = []
+    clauses: list[str] = []
+    renames: dict[str, dict[str, str]] = {}
 
     if "total_items" not in existing_columns:
         column_type = "INTEGER" if dialect == "sqlite" else "INT"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN total_items {column_type} NOT NULL DEFAULT 0"
-        )
+        clauses.append(f"ADD COLUMN total_items {column_type} NOT NULL DEFAULT 0")
 
     if "processed_items" not in existing_columns:
         column_type = "INTEGER" if dialect == "sqlite" else "INT"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN processed_items {column_type} NOT NULL DEFAULT 0"
-        )
+        clauses.append(f"ADD COLUMN processed_items {column_type} NOT NULL DEFAULT 0")
     if "plan_json" not in existing_columns:
         column_type = "TEXT" if dialect == "sqlite" else "TEXT"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN plan_json {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN plan_json {column_type} NULL")
     if "executor" not in existing_columns:
         column_type = "TEXT" if dialect == "sqlite" else "VARCHAR(20)"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN executor {column_type} NOT NULL DEFAULT 'server'"
-        )
+        clauses.append(f"ADD COLUMN executor {column_type} NOT NULL DEFAULT 'server'")
     if "agent_status" not in existing_columns:
         column_type = "TEXT" if dialect == "sqlite" else "VARCHAR(20)"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN agent_status {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN agent_status {column_type} NULL")
     if "agent_id" not in existing_columns:
         column_type = "INTEGER" if dialect == "sqlite" else "INT"
-        statements.append(
-            f"ALTER TABLE inspection_runs ADD COLUMN agent_id {column_type} NULL"
-        )
+        clauses.append(f"ADD COLUMN agent_id {column_type} NULL")
 
     if dialect != "sqlite":
-        statements.append(
-            "ALTER TABLE inspection_runs CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
-        )
+        clauses.extend(collations.charset_clauses("inspection_runs", {}))
 
     if "status" in existing_columns:
-        updates.extend(
-            [
-                "UPDATE inspection_runs SET status = 'queued' WHERE status = 'pending'",
-                "UPDATE inspection_runs SET status = 'finished' WHERE status = 'completed'",
-                "UPDATE inspection_runs SET status = 'failed' WHERE status = 'incomplete'",
-            ]
-        )
+        renames["status"] = {
+            "pending": "queued",
+            "completed": "finished",
+            "incomplete": "failed",
+        }
     if "agent_status" in existing_columns:
-        updates.extend(
-            [
-                "UPDATE inspection_runs SET agent_status = 'finished' WHERE agent_status = 'completed'",
-                "UPDATE inspection_runs SET agent_status = 'queued' WHERE agent_status = 'pending'",
-            ]
-        )
+        renames["agent_status"] = {"completed": "finished", "pending": "queued"}
 
-    if not statements and not updates:
-        return
-
-    with engine.begin() as connection:
-        for statement in statements:
-            connection.execute(text(statement))
-        for statement in updates:
-            connection.execute(text(statement))
+    if not clauses and not renames:
+        return None
+    statements = [_rename_values_statement("inspection_runs", renames)] if renames else []
+    return partial(_apply_table_changes, "inspection_runs", clauses, statements)
 
 
-def _ensure_inspection_results_schema() -> None:
-    inspector = inspect(engine)
-    if "inspection_results" not in inspector.get_table_names():
-        return
+def _plan_inspection_results_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]], collations: _Collations
+) -> Optional[Callable[[], None]]:
+    if "inspection_results" not in table_columns:
+        return None
 
-    columns = inspector.get_columns("inspection_results")
-    column_names = {column["name"] for column in columns}
+    column_names = table_columns["inspection_results"]
     dialect = engine.dialect.name
 
     # SQLite requires table rebuild when altering column nullability
     if dialect == "sqlite":
-        needs_rebuild = (
-            "item_name_cached" not in column_names
-            or any(
-                column["name"] == "item_id" and not column["nullable"]
-                for column in columns
-            )
+        needs_rebuild = any(
+            column["name"] == "item_id" and not column["nullable"]
+            for column in inspector.get_columns("inspection_results")
         )
         if needs_rebuild:
-            _rebuild_sqlite_inspection_results_table(column_names)
-        return
+            return partial(_rebuild_sqlite_inspection_results_table, column_names)
+        if "item_name_cached" not in column_names:
+            return _add_sqlite_item_name_cached
+        return None
 
-    statements: list[str] = []
+    clauses: list[str] = []
     item_id_fk = next(
         (
             fk
@@ -313,50 +559,60 @@ def _ensure_inspection_results_schema() -> None:
         ),
         None,
     )
-    if item_id_fk and item_id_fk.get("name"):
-        statements.append(
-            f"ALTER TABLE inspection_results DROP FOREIGN KEY {item_id_fk['name']}"
-        )
     if "item_name_cached" not in column_names:
-        statements.append(
-            "ALTER TABLE inspection_results "
+        clauses.append(
             "ADD COLUMN item_name_cached VARCHAR(100) "
             "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci "
             "NOT NULL DEFAULT ''"
         )
-    statements.append(
-        "ALTER TABLE inspection_results MODIFY item_id INTEGER NULL"
-    )
-    statements.append(
-        "ALTER TABLE inspection_results "
+    clauses.append("MODIFY item_id INTEGER NULL")
+    clauses.append(
         "ADD CONSTRAINT fk_inspection_results_item "
         "FOREIGN KEY (item_id) REFERENCES inspection_items(id) ON DELETE SET NULL"
     )
-    statements.append(
-        "ALTER TABLE inspection_results "
-        "CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
+    clauses.extend(collations.charset_clauses("inspection_results", {}))
+    return partial(
+        _alter_mysql_inspection_results, item_id_fk.get("name") if item_id_fk else None, clauses
     )
 
+
+def _alter_mysql_inspection_results(item_id_fk_name: Optional[str], clauses: list[str]) -> None:
     with engine.begin() as connection:
-        for statement in statements:
-            connection.execute(text(statement))
-        connection.execute(
-            text(
-                "UPDATE inspection_results r "
-                "LEFT JOIN inspection_items i ON r.item_id = i.id "
-                "SET r.item_name_cached = "
-                "CASE "
-                "WHEN r.item_name_cached IS NOT NULL AND r.item_name_cached <> '' "
-                "THEN r.item_name_cached "
-                "WHEN i.name IS NOT NULL THEN i.name "
-                "ELSE r.item_name_cached "
-                "END"
+        # MySQL 不允许在需要拷贝表的 ALTER 中同时删除并新增外键，删除外键单独执行。
+        if item_id_fk_name:
+            connection.execute(
+                text(f"ALTER TABLE inspection_results DROP FOREIGN KEY {item_id_fk_name}")
+            )
+        _alter_table(connection, "inspection_results", clauses)
+    _backfill_item_name_cached()
+
+
+def _add_sqlite_item_name_cached() -> None:
+    # 只缺缓存列时原地加列并回填，无需整表拷贝。
+    with engine.begin() as connection:
+        connection.execute(_SQLITE_ADD_ITEM_NAME_SQL)
+        connection.execute(_SQLITE_BACKFILL_ITEM_NAME_SQL)
+
+
+def _backfill_item_name_cached() -> None:
+    """按主键区间分批回填 item_name_cached，每批单独提交，避免长时间锁住整张结果表。"""
+    with engine.connect() as connection:
+        low, high = connection.execute(_RESULT_ID_BOUNDS_SQL).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+        with engine.begin() as connection:
+            connection.execute(
+                _MYSQL_BACKFILL_ITEM_NAME_SQL,
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE - 1},
             )
-        )
 
 
 def _rebuild_sqlite_inspection_results_table(existing_columns: set[str]) -> None:
     with engine.begin() as connection:
+        # 整表拷贝期间临时放大页缓存（约 200MB），结束后恢复原值。
+        cache_size = connection.execute(text("PRAGMA cache_size")).scalar()
+        connection.execute(text("PRAGMA cache_size=-200000"))
         connection.execute(text("PRAGMA foreign_keys=OFF"))
         connection.execute(
             text(
@@ -422,39 +678,66 @@ def _rebuild_sqlite_inspection_results_table(existing_columns: set[str]) -> None
             )
         )
         connection.execute(text("PRAGMA foreign_keys=ON"))
+        connection.execute(text(f"PRAGMA cache_size={int(cache_size)}"))
 
-def _ensure_audit_log_schema() -> None:
-    inspector = inspect(engine)
-    if "audit_logs" not in inspector.get_table_names():
-        return
+
+def _plan_audit_log_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]], collations: _Collations
+) -> Optional[Callable[[], None]]:
+    if "audit_logs" not in table_columns:
+        return None
 
     dialect = engine.dialect.name
     if dialect == "sqlite":
-        return
-
-    statements = [
-        "ALTER TABLE audit_logs CONVERT TO CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci",
-        "ALTER TABLE audit_logs MODIFY action VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
-        "ALTER TABLE audit_logs MODIFY entity_type VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
-        "ALTER TABLE audit_logs MODIFY description TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL",
-    ]
+        return None
+
+    clauses = collations.charset_clauses(
+        "audit_logs",
+        {
+            "action": "MODIFY action VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
+            "entity_type": "MODIFY entity_type VARCHAR(50) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL",
+            "description": "MODIFY description TEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL",
+        },
+    )
 
-    with engine.begin() as connection:
-        for statement in statements:
-            connection.execute(text(statement))
+    if not clauses:
+        return None
+    return partial(_apply_table_changes, "audit_logs", clauses)
 
 
-def _ensure_inspection_agents_schema() -> None:
-    inspector = inspect(engine)
-    if "inspection_agents" not in inspector.get_table_names():
-        return
+def _plan_inspection_agents_schema(
+    inspector: Inspector, table_columns: dict[str, set[str]]
+) -> Optional[Callable[[], None]]:
+    if "inspection_agents" not in table_columns:
+        return None
 
-    columns = {column["name"] for column in inspector.get_columns("inspection_agents")}
-    if "prometheus_url" in columns:
-        return
+    if "prometheus_url" in table_columns["inspection_agents"]:
+        return None
 
     dialect = engine.dialect.name
     column_type = "TEXT" if dialect == "sqlite" else "VARCHAR(255)"
     statement = f"ALTER TABLE inspection_agents ADD COLUMN prometheus_url {column_type} NULL"
+    return partial(_apply_table_changes, "inspection_agents", [], [statement])
+
+
+def _plan_indexes(inspector: Inspector, patched_tables: set[str]) -> list[SchemaPatch]:
+    """create_all 不会为已存在的表补建索引，这里按模型定义找出缺少的索引。
+
+    已有其它补丁的表（如 SQLite 重建结果表会丢掉原索引）在补丁之后按模型全部检查一遍。
+    """
+    patches: list[SchemaPatch] = []
+    for table in Base.metadata.sorted_tables:
+        if table.name in patched_tables:
+            indexes = list(table.indexes)
+        else:
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            indexes = [index for index in table.indexes if index.name not in existing]
+        if indexes:
+            patches.append((table.name, partial(_create_indexes, indexes)))
+    return patches
+
+
+def _create_indexes(indexes: list[Index]) -> None:
     with engine.begin() as connection:
-        connection.execute(text(statement))
+        for index in indexes:
+            index.create(bind=connection, checkfirst=True)
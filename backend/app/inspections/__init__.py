@@ -1,5 +1,17 @@
 """Collection of K8s inspection routines."""
 
-from .engine import CheckContext, DEFAULT_CHECKS, dispatch_checks
+from .engine import (
+    CheckContext,
+    DEFAULT_CHECKS,
+    dispatch_checks,
+    dispatch_checks_batch,
+    iter_dispatch_checks,
+)
 
-__all__ = ["dispatch_checks", "DEFAULT_CHECKS", "CheckContext"]
+__all__ = [
+    "dispatch_checks",
+    "dispatch_checks_batch",
+    "iter_dispatch_checks",
+    "DEFAULT_CHECKS",
+    "CheckContext",
+]
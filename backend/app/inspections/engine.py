@@ -1,29 +1,179 @@
 from __future__ import annotations
 
+import heapq
 import json
+import operator
+import re
 import shutil
 import subprocess
 import shlex
-from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Tuple
-
-from ..prometheus import PrometheusClient
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..prometheus import PrometheusClient, QueryResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from kubernetes import client as k8s_client
+    from kubernetes import config as k8s_config
+except Exception:  # pragma: no cover - optional dependency
+    k8s_client = None
+    k8s_config = None
 
 CHECK_STATUS_PASSED = "passed"
 CHECK_STATUS_WARNING = "warning"
 CHECK_STATUS_FAILED = "failed"
 
+# 巡检项均为 kubectl 子进程或 Prometheus HTTP 调用，属 I/O 密集，可用线程并发执行。
+CHECK_DISPATCH_MAX_WORKERS = 8
+
+KUBE_API_TIMEOUT_SECONDS = 15
+
+# Python 创建的文件描述符默认不可继承（PEP 446），子进程只会继承显式标记为可继承的 fd。
+# 关闭 close_fds 可避免在 fd 上限很高的容器中逐个关闭 fd，并让 CPython 使用 posix_spawn；
+# 若引入了将 fd 设为可继承的代码（如 os.set_inheritable），需重新评估该设置。
+SUBPROCESS_CLOSE_FDS = False
+
+# 由 apiserver 过滤掉正常 Pod（多个条件为 AND），健康集群下返回的列表通常为空。
+PROBLEM_POD_FIELD_SELECTOR = "status.phase!=Running,status.phase!=Succeeded"
+
 
 @dataclass
 class CheckContext:
     kubeconfig_path: str | None = None
     prom: PrometheusClient | None = None
+    # 本次巡检内的 Prometheus 查询结果（批量预取或首次查询时写入），按表达式索引。
+    prom_cache: Dict[str, QueryResult] = field(default_factory=dict)
+    # 本次巡检内 kubectl 调用结果，按参数元组索引，相同命令只执行一次。
+    kubectl_cache: Dict[Tuple[str, ...], Tuple[bool, str]] = field(default_factory=dict)
+    # 进程内复用的 kubernetes ApiClient（连接池 + 已解析的 kubeconfig），首次使用时创建。
+    _kube_api: object | None = field(default=None, init=False, repr=False, compare=False)
+    _kube_api_loaded: bool = field(default=False, init=False, repr=False, compare=False)
+    _kube_api_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+
+def _json_loads(content: str | bytes):
+    """解析 kubectl/API 返回的大块 JSON；orjson 的 JSONDecodeError 继承自 json.JSONDecodeError。"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _prom_query(context: CheckContext, expression: str) -> QueryResult:
+    cached = context.prom_cache.get(expression)
+    if cached is None:
+        cached = context.prom_cache[expression] = context.prom.query(expression)
+    return cached
+
+
+def _kube_api_client(context: CheckContext):
+    """返回基于 kubeconfig 的 ApiClient；未安装 kubernetes 客户端或加载失败时返回 None。"""
+    if k8s_client is None or k8s_config is None:
+        return None
+    with context._kube_api_lock:
+        if not context._kube_api_loaded:
+            context._kube_api_loaded = True
+            try:
+                context._kube_api = k8s_config.new_client_from_config(
+                    config_file=context.kubeconfig_path
+                )
+            except Exception:
+                context._kube_api = None
+        return context._kube_api
+
+
+def _core_api(context: CheckContext):
+    api_client = _kube_api_client(context)
+    if api_client is None:
+        return None
+    return k8s_client.CoreV1Api(api_client)
+
+
+def _fetch_server_version(context: CheckContext) -> Tuple[Optional[str], Optional[str]]:
+    """通过共享的 ApiClient 读取 /version，返回值约定同 _list_kube_items。"""
+    api_client = _kube_api_client(context)
+    if api_client is None:
+        return None, None
+    try:
+        response = k8s_client.VersionApi(api_client).get_code(
+            _preload_content=False, _request_timeout=KUBE_API_TIMEOUT_SECONDS
+        )
+        payload = _json_loads(response.data)
+    except Exception as exc:
+        reason = getattr(exc, "reason", None) or str(exc)
+        return None, f"Kubernetes API error: {reason}"
+    version = payload.get("gitVersion") or f"{payload.get('major', '')}.{payload.get('minor', '')}"
+    return version, None
+
+
+def _list_kube_items(
+    context: CheckContext, kind: str, field_selector: str | None = None
+) -> Tuple[Optional[List[dict]], Optional[str]]:
+    """通过 kubernetes 客户端读取 Node/Pod 列表。
+
+    返回 (items, None) 表示成功，(None, error) 表示 API 调用失败，
+    (None, None) 表示客户端不可用，调用方应回退到 kubectl。
+    """
+    api = _core_api(context)
+    if api is None:
+        return None, None
+    list_call = api.list_node if kind == "Node" else api.list_pod_for_all_namespaces
+    kwargs: Dict[str, object] = {}
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+    try:
+        # 跳过客户端的模型反序列化，直接解析原始 JSON，与 kubectl 输出结构一致。
+        try:
+            response = list_call(
+                _preload_content=False, _request_timeout=KUBE_API_TIMEOUT_SECONDS, **kwargs
+            )
+        except Exception as exc:
+            if not kwargs or getattr(exc, "status", None) != 400:
+                raise
+            # apiserver 不支持该字段选择器时回退为拉取全量列表。
+            response = list_call(
+                _preload_content=False, _request_timeout=KUBE_API_TIMEOUT_SECONDS
+            )
+        return _json_loads(response.data).get("items") or [], None
+    except Exception as exc:
+        reason = getattr(exc, "reason", None) or str(exc)
+        return None, f"Kubernetes API error: {reason}"
+
+
+_kubectl_path: Optional[str] = None
+
+
+def _resolve_kubectl() -> Optional[str]:
+    """缓存 kubectl 的绝对路径；未找到时不缓存，便于安装后无需重启即可生效。"""
+    global _kubectl_path
+    if _kubectl_path is None:
+        _kubectl_path = shutil.which("kubectl")
+    return _kubectl_path
 
 
 def _run_kubectl(args: Iterable[str], context: CheckContext) -> Tuple[bool, str]:
-    if shutil.which("kubectl") is None:
+    key = tuple(args)
+    cached = context.kubectl_cache.get(key)
+    if cached is None:
+        cached = context.kubectl_cache[key] = _exec_kubectl(key, context)
+    return cached
+
+
+def _exec_kubectl(args: Tuple[str, ...], context: CheckContext) -> Tuple[bool, str]:
+    kubectl = _resolve_kubectl()
+    if kubectl is None:
         return False, "kubectl command not found on server."
-    cmd = ["kubectl"]
+    cmd = [kubectl]
     if context.kubeconfig_path:
         cmd.extend(["--kubeconfig", context.kubeconfig_path])
     cmd.extend(args)
@@ -32,16 +182,20 @@ def _run_kubectl(args: Iterable[str], context: CheckContext) -> Tuple[bool, str]
             cmd,
             check=False,
             capture_output=True,
-            text=True,
             timeout=15,
+            close_fds=SUBPROCESS_CLOSE_FDS,
         )
     except Exception as exc:  # pragma: no cover - defensive path
         return False, f"kubectl execution error: {exc}"
 
     if result.returncode != 0:
-        return False, result.stderr.strip() or "kubectl returned non-zero exit code."
-    return True, result.stdout.strip()
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        return False, stderr or "kubectl returned non-zero exit code."
+    return True, result.stdout.decode("utf-8", errors="replace").strip()
+
 
+# 含引号、反斜杠或 shlex 不视为分隔符的空白字符时才交给 shlex 解析，其余情况与 str.split() 结果一致。
+_NEEDS_SHLEX_RE = re.compile(r"[\"'\\]|[^\S \t\r\n]")
 
 DEFAULT_COMMAND_TIMEOUT = 30
 MAX_OUTPUT_LENGTH = 2000
@@ -84,7 +238,10 @@ def _execute_command_check(config: Dict[str, object], context: CheckContext) ->
             cmd = rendered
         else:
             try:
-                cmd = shlex.split(rendered)
+                if _NEEDS_SHLEX_RE.search(rendered):
+                    cmd = shlex.split(rendered)
+                else:
+                    cmd = rendered.split()
             except ValueError as exc:
                 return (
                     CHECK_STATUS_WARNING,
@@ -119,6 +276,7 @@ def _execute_command_check(config: Dict[str, object], context: CheckContext) ->
             capture_output=True,
             text=True,
             timeout=timeout,
+            close_fds=SUBPROCESS_CLOSE_FDS,
         )
     except subprocess.TimeoutExpired:
         suggestion = config.get("suggestion_on_timeout") or config.get("suggestion_on_fail") or "Check command runtime or increase timeout."
@@ -172,20 +330,19 @@ def _execute_command_check(config: Dict[str, object], context: CheckContext) ->
     return CHECK_STATUS_FAILED, detail, suggestion
 
 
-def _compare(value: float, threshold: float, operator: str) -> bool:
-    if operator == ">=":
-        return value >= threshold
-    if operator == ">":
-        return value > threshold
-    if operator == "<=":
-        return value <= threshold
-    if operator == "<":
-        return value < threshold
-    if operator == "==":
-        return value == threshold
-    if operator == "!=":
-        return value != threshold
-    return value >= threshold
+_COMPARATORS: Dict[str, Callable[[float, float], bool]] = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _comparator(comparison: str) -> Callable[[float, float], bool]:
+    """未识别的比较符按 >= 处理。"""
+    return _COMPARATORS.get(comparison, operator.ge)
 
 
 def _aggregate_values(values: list[float], mode: str) -> float:
@@ -201,6 +358,23 @@ def _aggregate_values(values: list[float], mode: str) -> float:
     return max(values)
 
 
+# 已体现在样本标识（命名空间/Pod/容器/实例）中的标签，不再作为附加标签重复展示。
+_IDENTITY_LABELS = frozenset(
+    {
+        "__name__",
+        "namespace",
+        "ns",
+        "pod",
+        "pod_name",
+        "container",
+        "container_name",
+        "instance",
+        "node",
+        "job",
+    }
+)
+
+
 def _format_metric_identity(metric: Dict[str, object]) -> str:
     if not isinstance(metric, dict):
         return "sample"
@@ -222,25 +396,14 @@ def _format_metric_identity(metric: Dict[str, object]) -> str:
     if container:
         base = f"{base}:{container}"
 
-    extra_labels: List[str] = []
-    for key in sorted(metric):
-        if key in {
-            "__name__",
-            "namespace",
-            "ns",
-            "pod",
-            "pod_name",
-            "container",
-            "container_name",
-            "instance",
-            "node",
-            "job",
-        }:
-            continue
-        value = metric.get(key)
-        if value in (None, "", "-"):
-            continue
-        extra_labels.append(f"{key}={value}")
+    extra_labels = [
+        f"{key}={value}"
+        for key, value in sorted(
+            (key, value)
+            for key, value in metric.items()
+            if key not in _IDENTITY_LABELS and value not in (None, "", "-")
+        )
+    ]
 
     if extra_labels:
         return f"{base} ({', '.join(extra_labels)})"
@@ -248,11 +411,7 @@ def _format_metric_identity(metric: Dict[str, object]) -> str:
 
 
 def _format_numeric_value(value: float) -> str:
-    formatted = f"{value:.4f}"
-    formatted = formatted.rstrip("0").rstrip(".")
-    if not formatted:
-        formatted = "0"
-    return formatted
+    return ("%.4f" % value).rstrip("0").rstrip(".") or "0"
 
 
 def _execute_promql_check(config: Dict[str, object], context: CheckContext) -> Tuple[str, str, str]:
@@ -272,26 +431,44 @@ def _execute_promql_check(config: Dict[str, object], context: CheckContext) -> T
             "PromQL expression is not configured.",
             "Provide an expression in the inspection item definition.",
         )
-    prom = context.prom
-    ok, results, message = prom.query(str(expression))
+    ok, results, message = _prom_query(context, str(expression))
     if not ok:
         suggestion = config.get("suggestion_on_error") or "Check Prometheus endpoint availability."
         return CHECK_STATUS_WARNING, message, suggestion
 
-    samples: List[Dict[str, object]] = []
+    comparison = str(config.get("comparison", ">=")).strip()
+    fail_threshold_raw = config.get("fail_threshold")
+    warn_threshold_raw = config.get("warn_threshold")
+
+    def _to_float(raw: object) -> float | None:
+        try:
+            return float(raw)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return None
+
+    fail_threshold_value = _to_float(fail_threshold_raw)
+    warn_threshold_value = _to_float(warn_threshold_raw)
+
+    compare = _comparator(comparison)
+
+    # 阈值与样本无关，解析样本的同时完成告警/预警分组，只遍历一次结果集。
+    # 样本按下标存放在 metrics/values 两个并行列表中，分组与排序只处理整数下标。
+    metrics: List[Dict[str, object]] = []
     values: List[float] = []
+    fail_matches: List[int] = []
+    warn_matches: List[int] = []
     for sample in results or []:
         value = PrometheusClient.extract_value(sample)
         if value is None:
             continue
         metric_raw = sample.get("metric")
-        metric_dict: Dict[str, object]
-        if isinstance(metric_raw, dict):
-            metric_dict = metric_raw
-        else:
-            metric_dict = {}
-        samples.append({"metric": metric_dict, "value": value})
+        index = len(values)
+        metrics.append(metric_raw if isinstance(metric_raw, dict) else {})
         values.append(value)
+        if fail_threshold_value is not None and compare(value, fail_threshold_value):
+            fail_matches.append(index)
+        elif warn_threshold_value is not None and compare(value, warn_threshold_value):
+            warn_matches.append(index)
 
     if not values:
         empty_status = config.get("status_if_empty", CHECK_STATUS_WARNING)
@@ -302,49 +479,18 @@ def _execute_promql_check(config: Dict[str, object], context: CheckContext) -> T
     aggregate_mode = str(config.get("aggregate", "max"))
     aggregate_value = _aggregate_values(values, aggregate_mode)
 
-    comparison = str(config.get("comparison", ">=")).strip()
-    fail_threshold_raw = config.get("fail_threshold")
-    warn_threshold_raw = config.get("warn_threshold")
-
-    def _to_float(raw: object) -> float | None:
-        try:
-            return float(raw)  # type: ignore[arg-type]
-        except (TypeError, ValueError):
-            return None
-
-    fail_threshold_value = _to_float(fail_threshold_raw)
-    warn_threshold_value = _to_float(warn_threshold_raw)
-
     status = CHECK_STATUS_PASSED
     suggestion = config.get("suggestion_on_success") or ""
 
-    if fail_threshold_value is not None and _compare(float(aggregate_value), fail_threshold_value, comparison):
+    if fail_threshold_value is not None and compare(float(aggregate_value), fail_threshold_value):
         status = CHECK_STATUS_WARNING
         suggestion = config.get("suggestion_on_fail") or suggestion
-    elif warn_threshold_value is not None and _compare(float(aggregate_value), warn_threshold_value, comparison):
+    elif warn_threshold_value is not None and compare(float(aggregate_value), warn_threshold_value):
         status = CHECK_STATUS_WARNING
         suggestion = config.get("suggestion_on_warn") or suggestion
 
-    def _classify(value: float) -> str | None:
-        if fail_threshold_value is not None and _compare(value, fail_threshold_value, comparison):
-            return "fail"
-        if warn_threshold_value is not None and _compare(value, warn_threshold_value, comparison):
-            return "warn"
-        return None
-
-    fail_matches: List[Dict[str, object]] = []
-    warn_matches: List[Dict[str, object]] = []
-    for entry in samples:
-        category = _classify(entry["value"])  # type: ignore[index]
-        if category == "fail":
-            fail_matches.append(entry)
-        elif category == "warn":
-            warn_matches.append(entry)
-
-    reverse_sort = comparison not in {"<", "<="}
-    fail_matches.sort(key=lambda item: item["value"], reverse=reverse_sort)  # type: ignore[index]
-    warn_matches.sort(key=lambda item: item["value"], reverse=reverse_sort)  # type: ignore[index]
-    sorted_samples = sorted(samples, key=lambda item: item["value"], reverse=reverse_sort)  # type: ignore[index]
+    # 只展示前 max_rows 条，按需对最终展示的那一组做有界选取，无需整体排序。
+    select_top = heapq.nlargest if comparison not in {"<", "<="} else heapq.nsmallest
 
     def _format_value(value: float) -> str:
         fmt = config.get("value_format")
@@ -394,7 +540,7 @@ def _execute_promql_check(config: Dict[str, object], context: CheckContext) -> T
     except (TypeError, ValueError):
         max_rows = default_limit
 
-    matches_to_show: List[Dict[str, object]]
+    matches_to_show: Sequence[int]
     headline: str
     if fail_matches:
         matches_to_show = fail_matches
@@ -409,19 +555,17 @@ def _execute_promql_check(config: Dict[str, object], context: CheckContext) -> T
             f"展示前 {min(len(warn_matches), max_rows)} 条："
         )
     else:
-        matches_to_show = sorted_samples
+        matches_to_show = range(len(values))
         if matches_to_show:
             headline = (
-                f"共收到 {len(sorted_samples)} 条样本，展示前 {min(len(sorted_samples), max_rows)} 条："
+                f"共收到 {len(values)} 条样本，展示前 {min(len(values), max_rows)} 条："
             )
         else:
             headline = "未获得可展示的样本。"
 
     lines = [detail_prefix.strip()]
-    for entry in matches_to_show[:max_rows]:
-        metric = entry.get("metric") if isinstance(entry, dict) else {}
-        value = entry.get("value", 0.0) if isinstance(entry, dict) else 0.0
-        lines.append(f"- {_format_metric_identity(metric)}: {_format_value(float(value))}")
+    for index in select_top(max_rows, matches_to_show, key=values.__getitem__):
+        lines.append(f"- {_format_metric_identity(metrics[index])}: {_format_value(values[index])}")
 
     detail = "\n".join(line for line in lines if line)
 
@@ -439,72 +583,125 @@ def _require_prom(context: CheckContext) -> Tuple[str, str, str] | None:
 
 
 def _format_percentage(value: float) -> str:
-    return f"{value:.2f}%"
+    return "%.2f%%" % value
+
+
+_SERVER_VERSION_RE = re.compile(r"^server version.*$", re.IGNORECASE | re.MULTILINE)
 
 
 def check_cluster_version(context: CheckContext) -> Tuple[str, str, str]:
+    version, error = _fetch_server_version(context)
+    if error:
+        return CHECK_STATUS_WARNING, error, "Verify kubectl connectivity to the cluster."
+    if version:
+        return CHECK_STATUS_PASSED, f"Server Version: {version}", ""
     ok, payload = _run_kubectl(["version"], context)
     if not ok:
         return CHECK_STATUS_WARNING, payload, "Verify kubectl connectivity to the cluster."
-    server_line = next(
-        (line for line in payload.splitlines() if line.lower().startswith("server version")),
-        "",
-    )
-    if not server_line:
+    match = _SERVER_VERSION_RE.search(payload)
+    if not match:
         return CHECK_STATUS_WARNING, payload, "未能从输出中解析到 Server Version。"
-    return CHECK_STATUS_PASSED, server_line.strip(), ""
+    return CHECK_STATUS_PASSED, match.group(0).strip(), ""
+
+
+# kubectl 回退路径只输出判断所需的字段（制表符分隔），不再拉取并解析完整 JSON。
+NODE_READY_JSONPATH = (
+    r'jsonpath={range .items[*]}{.metadata.name}{"\t"}'
+    r'{.status.conditions[?(@.type=="Ready")].status}{"\n"}{end}'
+)
+POD_PHASE_JSONPATH = (
+    r'jsonpath={range .items[*]}{.metadata.namespace}{"\t"}{.metadata.name}{"\t"}'
+    r'{.status.phase}{"\n"}{end}'
+)
+
+
+def _split_rows(payload: str, width: int) -> List[List[str]]:
+    rows = []
+    for line in payload.splitlines():
+        if not line.strip():
+            continue
+        fields = line.split("\t")
+        fields.extend([""] * (width - len(fields)))
+        rows.append(fields[:width])
+    return rows
 
 
 def check_nodes_status(context: CheckContext) -> Tuple[str, str, str]:
-    ok, payload = _run_kubectl(["get", "nodes", "-o", "json"], context)
-    if not ok:
+    items, error = _list_kube_items(context, "Node")
+    if error:
         return (
             CHECK_STATUS_WARNING,
-            payload,
+            error,
             "Ensure nodes are reachable and kubeconfig is configured.",
         )
-    try:
-        parsed = json.loads(payload)
-    except json.JSONDecodeError:
-        return CHECK_STATUS_WARNING, payload, "kubectl output not in JSON format."
-
-    not_ready = []
-    for item in parsed.get("items", []):
-        conditions = item.get("status", {}).get("conditions", [])
-        ready_state = next(
-            (cond for cond in conditions if cond.get("type") == "Ready"), None
-        )
-        if ready_state and ready_state.get("status") != "True":
-            not_ready.append(item["metadata"]["name"])
+    if items is not None:
+        nodes = []
+        for item in items:
+            conditions = item.get("status", {}).get("conditions") or ()
+            ready_status = {cond.get("type"): cond.get("status") for cond in conditions}.get("Ready")
+            nodes.append((item["metadata"]["name"], ready_status))
+    else:
+        ok, payload = _run_kubectl(["get", "nodes", "-o", NODE_READY_JSONPATH], context)
+        if not ok:
+            return (
+                CHECK_STATUS_WARNING,
+                payload,
+                "Ensure nodes are reachable and kubeconfig is configured.",
+            )
+        nodes = [(name, ready or None) for name, ready in _split_rows(payload, 2)]
+
+    not_ready = [
+        name for name, ready_status in nodes
+        if ready_status is not None and ready_status != "True"
+    ]
 
     if not not_ready:
-        return CHECK_STATUS_PASSED, f"{len(parsed.get('items', []))} nodes ready.", ""
+        return CHECK_STATUS_PASSED, f"{len(nodes)} nodes ready.", ""
     detail = "Nodes not ready: " + ", ".join(not_ready)
     suggestion = "Investigate node conditions via 'kubectl describe node <name>'."
     return CHECK_STATUS_FAILED, detail, suggestion
 
 
 def check_pods_status(context: CheckContext) -> Tuple[str, str, str]:
-    ok, payload = _run_kubectl(["get", "pods", "--all-namespaces", "-o", "json"], context)
-    if not ok:
+    items, error = _list_kube_items(context, "Pod", PROBLEM_POD_FIELD_SELECTOR)
+    if error:
         return (
             CHECK_STATUS_WARNING,
-            payload,
+            error,
             "Verify cluster access or specify kubeconfig.",
         )
-    try:
-        parsed = json.loads(payload)
-    except json.JSONDecodeError:
-        return CHECK_STATUS_WARNING, payload, "kubectl output not in JSON format."
-
-    failing = []
-    for item in parsed.get("items", []):
-        status = item.get("status", {})
-        phase = status.get("phase")
-        if phase not in {"Running", "Succeeded"}:
-            namespace = item.get("metadata", {}).get("namespace", "default")
-            name = item.get("metadata", {}).get("name")
-            failing.append(f"{namespace}/{name} ({phase})")
+    if items is not None:
+        pods = [
+            (
+                item.get("metadata", {}).get("namespace", "default"),
+                item.get("metadata", {}).get("name"),
+                item.get("status", {}).get("phase"),
+            )
+            for item in items
+        ]
+    else:
+        args = ["get", "pods", "--all-namespaces", "-o", POD_PHASE_JSONPATH]
+        ok, payload = _run_kubectl(
+            [*args, f"--field-selector={PROBLEM_POD_FIELD_SELECTOR}"], context
+        )
+        if not ok and "field label" in payload:
+            ok, payload = _run_kubectl(args, context)
+        if not ok:
+            return (
+                CHECK_STATUS_WARNING,
+                payload,
+                "Verify cluster access or specify kubeconfig.",
+            )
+        pods = [
+            (namespace or "default", name, phase or None)
+            for namespace, name, phase in _split_rows(payload, 3)
+        ]
+
+    failing = [
+        f"{namespace}/{name} ({phase})"
+        for namespace, name, phase in pods
+        if phase not in {"Running", "Succeeded"}
+    ]
 
     if not failing:
         return CHECK_STATUS_PASSED, "All pods running or completed.", ""
@@ -535,16 +732,45 @@ def check_pods_status(context: CheckContext) -> Tuple[str, str, str]:
 #     return CHECK_STATUS_PASSED, payload[:2000], "Use kubectl get events for full details."
 
 
+PROMQL_CLUSTER_CPU_USAGE = (
+    "sum(rate(node_cpu_seconds_total{mode!='idle'}[5m])) "
+    "/ sum(rate(node_cpu_seconds_total[5m])) * 100"
+)
+PROMQL_CLUSTER_MEMORY_USAGE = (
+    "(sum(node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) "
+    "/ sum(node_memory_MemTotal_bytes)) * 100"
+)
+# 节点维度的表达式返回全部实例，由客户端取前 HOTSPOT_TOP_N 个，Prometheus 无需再排序。
+PROMQL_NODE_CPU_HOTSPOTS = (
+    "(1 - avg by (instance)("
+    "rate(node_cpu_seconds_total{mode='idle'}[5m])"
+    ")) * 100"
+)
+PROMQL_NODE_MEMORY_PRESSURE = (
+    "(("
+    "node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes"
+    ") / node_memory_MemTotal_bytes) * 100"
+)
+PROMQL_CLUSTER_DISK_IO = "sum by (instance)(rate(node_disk_io_time_seconds_total[5m]))"
+
+HOTSPOT_TOP_N = 5
+
+
+def _topk_readings(results: List[dict], k: int = HOTSPOT_TOP_N) -> List[Tuple[str, float]]:
+    """把按节点的样本解析为 (节点名, 数值)，跳过无法解析的值，返回数值最大的 k 个（降序）。"""
+    extract_value = PrometheusClient.extract_value
+    readings = []
+    for sample in results:
+        value = extract_value(sample)
+        if value is None:
+            continue
+        metric = sample.get("metric") or {}
+        readings.append((metric.get("instance") or metric.get("node") or "unknown", value))
+    return heapq.nlargest(k, readings, key=lambda item: item[1])
+
+
 def check_cluster_cpu_usage(context: CheckContext) -> Tuple[str, str, str]:
-    missing = _require_prom(context)
-    if missing:
-        return missing
-    prom = context.prom
-    expression = (
-        "sum(rate(node_cpu_seconds_total{mode!='idle'}[5m])) "
-        "/ sum(rate(node_cpu_seconds_total[5m])) * 100"
-    )
-    ok, results, message = prom.query(expression)
+    ok, results, message = _prom_query(context, PROMQL_CLUSTER_CPU_USAGE)
     if not ok:
         return CHECK_STATUS_WARNING, message, "确认 Prometheus 服务可访问，且节点指标已采集。"
     if not results:
@@ -566,15 +792,7 @@ def check_cluster_cpu_usage(context: CheckContext) -> Tuple[str, str, str]:
 
 
 def check_cluster_memory_usage(context: CheckContext) -> Tuple[str, str, str]:
-    missing = _require_prom(context)
-    if missing:
-        return missing
-    prom = context.prom
-    expression = (
-        "(sum(node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) "
-        "/ sum(node_memory_MemTotal_bytes)) * 100"
-    )
-    ok, results, message = prom.query(expression)
+    ok, results, message = _prom_query(context, PROMQL_CLUSTER_MEMORY_USAGE)
     if not ok:
         return CHECK_STATUS_WARNING, message, "确认 Prometheus 正在采集 node_exporter 内存指标。"
     if not results:
@@ -596,35 +814,18 @@ def check_cluster_memory_usage(context: CheckContext) -> Tuple[str, str, str]:
 
 
 def check_node_cpu_hotspots(context: CheckContext) -> Tuple[str, str, str]:
-    missing = _require_prom(context)
-    if missing:
-        return missing
-    prom = context.prom
-    expression = (
-        "topk(5, (1 - avg by (instance)("
-        "rate(node_cpu_seconds_total{mode='idle'}[5m])"
-        ")) * 100)"
-    )
-    ok, results, message = prom.query(expression)
+    ok, results, message = _prom_query(context, PROMQL_NODE_CPU_HOTSPOTS)
     if not ok:
         return CHECK_STATUS_WARNING, message, "检查 Prometheus 节点 CPU 指标抓取是否正常。"
     if not results:
         return CHECK_STATUS_PASSED, "所有节点 CPU 使用率较低。", ""
 
-    readings = []
-    for sample in results:
-        metric = sample.get("metric", {})
-        node_name = metric.get("instance") or metric.get("node") or "unknown"
-        value = PrometheusClient.extract_value(sample)
-        if value is None:
-            continue
-        readings.append((node_name, value))
+    readings = _topk_readings(results)
     if not readings:
         return CHECK_STATUS_WARNING, "无法解析节点 CPU 指标。", "确认节点标签（instance/node）是否存在。"
 
-    readings.sort(key=lambda item: item[1], reverse=True)
     summary = ", ".join(
-        f"{name}: {_format_percentage(value)}" for name, value in readings[:5]
+        f"{name}: {_format_percentage(value)}" for name, value in readings
     )
     worst = readings[0][1]
     if worst >= 90:
@@ -640,35 +841,18 @@ def check_node_cpu_hotspots(context: CheckContext) -> Tuple[str, str, str]:
 
 
 def check_node_memory_pressure(context: CheckContext) -> Tuple[str, str, str]:
-    missing = _require_prom(context)
-    if missing:
-        return missing
-    prom = context.prom
-    expression = (
-        "topk(5, (("
-        "node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes"
-        ") / node_memory_MemTotal_bytes) * 100)"
-    )
-    ok, results, message = prom.query(expression)
+    ok, results, message = _prom_query(context, PROMQL_NODE_MEMORY_PRESSURE)
     if not ok:
         return CHECK_STATUS_WARNING, message, "确保 node_exporter 正在采集内存指标。"
     if not results:
         return CHECK_STATUS_PASSED, "所有节点内存使用率正常。", ""
 
-    readings = []
-    for sample in results:
-        metric = sample.get("metric", {})
-        node_name = metric.get("instance") or metric.get("node") or "unknown"
-        value = PrometheusClient.extract_value(sample)
-        if value is None:
-            continue
-        readings.append((node_name, value))
+    readings = _topk_readings(results)
     if not readings:
         return CHECK_STATUS_WARNING, "Prometheus 返回的内存数据无法解析。", "检查指标标签。"
 
-    readings.sort(key=lambda item: item[1], reverse=True)
     summary = ", ".join(
-        f"{name}: {_format_percentage(value)}" for name, value in readings[:5]
+        f"{name}: {_format_percentage(value)}" for name, value in readings
     )
     worst = readings[0][1]
     if worst >= 95:
@@ -684,32 +868,19 @@ def check_node_memory_pressure(context: CheckContext) -> Tuple[str, str, str]:
 
 
 def check_cluster_disk_io(context: CheckContext) -> Tuple[str, str, str]:
-    missing = _require_prom(context)
-    if missing:
-        return missing
-    prom = context.prom
-    expression = "topk(5, sum by (instance)(rate(node_disk_io_time_seconds_total[5m])))"
-    ok, results, message = prom.query(expression)
+    ok, results, message = _prom_query(context, PROMQL_CLUSTER_DISK_IO)
     if not ok:
         return CHECK_STATUS_WARNING, message, "确保 Prometheus 抓取到 node_disk_io_time_seconds_total 指标。"
     if not results:
         return CHECK_STATUS_PASSED, "Prometheus 未检测到显著的磁盘 IO。", ""
 
-    readings = []
-    for sample in results:
-        metric = sample.get("metric", {})
-        node_name = metric.get("instance") or metric.get("node") or "unknown"
-        value = PrometheusClient.extract_value(sample)
-        if value is None:
-            continue
-        readings.append((node_name, value))
+    readings = _topk_readings(results)
 
     if not readings:
         return CHECK_STATUS_WARNING, "磁盘 IO 指标无法解析。", "确认节点导出器是否暴露磁盘 IO 指标。"
 
-    readings.sort(key=lambda item: item[1], reverse=True)
     summary = ", ".join(
-        f"{name}: {value:.4f}s/s" for name, value in readings[:5]
+        f"{name}: {value:.4f}s/s" for name, value in readings
     )
     worst = readings[0][1]
     status = CHECK_STATUS_PASSED
@@ -723,16 +894,26 @@ def check_cluster_disk_io(context: CheckContext) -> Tuple[str, str, str]:
     return status, f"Top node disk IO (s/s): {summary}", suggestion
 
 
-HANDLERS: Dict[str, Callable[[CheckContext], Tuple[str, str, str]]] = {
-    "cluster_version": check_cluster_version,
-    "nodes_status": check_nodes_status,
-    "pods_status": check_pods_status,
-    # "events_recent": check_events_recent,
-    "cluster_cpu_usage": check_cluster_cpu_usage,
-    "cluster_memory_usage": check_cluster_memory_usage,
-    "node_cpu_hotspots": check_node_cpu_hotspots,
-    "node_memory_pressure": check_node_memory_pressure,
-    "cluster_disk_io": check_cluster_disk_io,
+# check_type -> (处理函数, 是否依赖 Prometheus)；依赖 Prometheus 的处理函数由调度方统一校验 context.prom。
+HANDLERS: "MappingProxyType[str, Tuple[Callable[[CheckContext], Tuple[str, str, str]], bool]]" = MappingProxyType({
+    "cluster_version": (check_cluster_version, False),
+    "nodes_status": (check_nodes_status, False),
+    "pods_status": (check_pods_status, False),
+    # "events_recent": (check_events_recent, False),
+    "cluster_cpu_usage": (check_cluster_cpu_usage, True),
+    "cluster_memory_usage": (check_cluster_memory_usage, True),
+    "node_cpu_hotspots": (check_node_cpu_hotspots, True),
+    "node_memory_pressure": (check_node_memory_pressure, True),
+    "cluster_disk_io": (check_cluster_disk_io, True),
+})
+
+# 内置 Prometheus 巡检项使用的表达式，批量执行前统一预取。
+PROMQL_BY_CHECK_TYPE: Dict[str, str] = {
+    "cluster_cpu_usage": PROMQL_CLUSTER_CPU_USAGE,
+    "cluster_memory_usage": PROMQL_CLUSTER_MEMORY_USAGE,
+    "node_cpu_hotspots": PROMQL_NODE_CPU_HOTSPOTS,
+    "node_memory_pressure": PROMQL_NODE_MEMORY_PRESSURE,
+    "cluster_disk_io": PROMQL_CLUSTER_DISK_IO,
 }
 
 DEFAULT_CHECKS = [
@@ -813,11 +994,89 @@ def dispatch_checks(
         return _execute_command_check(config or {}, context)
     if check_type == "promql":
         return _execute_promql_check(config or {}, context)
-    handler = HANDLERS.get(check_type)
-    if handler is None:
+    spec = HANDLERS.get(check_type)
+    if spec is None:
         return (
             CHECK_STATUS_WARNING,
             f"No handler implemented for check type '{check_type}'.",
             "Create a handler in inspections.engine.HANDLERS or use a command/promql definition.",
         )
+    handler, needs_prom = spec
+    if needs_prom:
+        missing = _require_prom(context)
+        if missing:
+            return missing
     return handler(context)
+
+
+def _prefetch_prom(
+    checks: Sequence[Tuple[str, Optional[Dict[str, object]]]],
+    context: CheckContext,
+) -> None:
+    """一次并发取回本批巡检需要的全部 PromQL 结果，各巡检项执行时直接读取。"""
+    if context.prom is None:
+        return
+    expressions: List[str] = []
+    for check_type, config in checks:
+        if check_type == "promql":
+            expression = (config or {}).get("expression") if isinstance(config, dict) else None
+            if expression:
+                expressions.append(str(expression))
+            continue
+        expression = PROMQL_BY_CHECK_TYPE.get(check_type)
+        if expression:
+            expressions.append(expression)
+    missing = [expr for expr in expressions if expr not in context.prom_cache]
+    if missing:
+        context.prom_cache.update(context.prom.query_many(missing))
+
+
+def iter_dispatch_checks(
+    checks: Sequence[Tuple[str, Optional[Dict[str, object]]]],
+    context: CheckContext,
+    *,
+    max_workers: int = CHECK_DISPATCH_MAX_WORKERS,
+) -> Iterator[Tuple[str, str, str]]:
+    """并发执行多个巡检项，按提交顺序逐个产出结果。
+
+    只在调用方取下一个结果时补充提交，同时在途的巡检项不超过 max_workers，
+    调用方暂停取值时不会再启动新的巡检；提前关闭生成器（如巡检被取消）时，尚未开始的巡检项会被取消。
+    """
+    checks = list(checks)
+    if not checks:
+        return
+    window = max(1, min(max_workers, len(checks)))
+    executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix="inspection-check")
+    try:
+        _prefetch_prom(checks, context)
+        # context.prom 在一批巡检内不变，只校验一次；未配置时依赖 Prometheus 的内置巡检项直接返回提示。
+        missing_prom = _require_prom(context)
+        skipped: Optional[Future] = None
+        if missing_prom:
+            skipped = Future()
+            skipped.set_result(missing_prom)
+        remaining = iter(checks)
+        pending: deque = deque()
+        while True:
+            for check_type, config in remaining:
+                if skipped is not None and HANDLERS.get(check_type, (None, False))[1]:
+                    pending.append(skipped)
+                else:
+                    pending.append(executor.submit(dispatch_checks, check_type, context, config))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def dispatch_checks_batch(
+    checks: Sequence[Tuple[str, Optional[Dict[str, object]]]],
+    context: CheckContext,
+    *,
+    max_workers: int = CHECK_DISPATCH_MAX_WORKERS,
+) -> List[Tuple[str, str, str]]:
+    """并发执行多个巡检项，结果顺序与 checks 一致。"""
+    return list(iter_dispatch_checks(checks, context, max_workers=max_workers))
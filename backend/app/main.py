@@ -1,10 +1,12 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
 import secrets
 import threading
+import time
 from dataclasses import dataclass, field
 import base64
 import binascii
@@ -20,7 +22,8 @@ import subprocess
 import yaml
 from fastapi import APIRouter, Depends, FastAPI, File, Form, HTTPException, UploadFile, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response
 from sqlalchemy.orm import Session
 import urllib3
 from pydantic import ValidationError
@@ -35,11 +38,20 @@ except Exception:  # pragma: no cover - optional dependency
     ApiException = Exception
 
 from . import crud, models, schemas
-from .database import SessionLocal, ensure_runtime_directories, init_db
-from .inspections import CheckContext, DEFAULT_CHECKS, dispatch_checks
+from .audit import audit_buffer
+from .database import (
+    ReadOnlySessionLocal,
+    SessionLocal,
+    ensure_runtime_directories,
+    init_db_fast,
+    schema_pending_tables,
+    schema_ready,
+    upgrade_schema,
+)
+from .inspections import CheckContext, DEFAULT_CHECKS, iter_dispatch_checks
 from .license import LicenseError, license_manager
 from .pdf import generate_markdown_report, generate_pdf_report
-from .prometheus import PrometheusClient
+from .prometheus import PrometheusClient, invalidate_query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +60,35 @@ _INSPECTION_EXECUTOR = ThreadPoolExecutor(max_workers=4)
 _DEFAULT_INSPECTIONS_SENTINEL = Path("data/state/default_inspections_seeded.flag")
 AGENT_HEARTBEAT_TIMEOUT_MINUTES = 5
 AGENT_HEARTBEAT_TIMEOUT = timedelta(minutes=AGENT_HEARTBEAT_TIMEOUT_MINUTES)
+AGENT_TASK_MAX_WAIT_SECONDS = 60
+# 长轮询在未收到本进程的入队通知时，按该间隔兜底重查（覆盖其它进程入队的任务）。
+AGENT_TASK_WAIT_INTERVAL_SECONDS = 5.0
+
+# 长轮询等待的事件：有 Agent 任务入队时置位并换成新事件，等待方先取引用再查询，不会丢失通知。
+_agent_task_loop: Optional[asyncio.AbstractEventLoop] = None
+_agent_task_event: Optional[asyncio.Event] = None
+
+
+def _current_agent_task_event() -> asyncio.Event:
+    global _agent_task_loop, _agent_task_event
+    if _agent_task_event is None:
+        _agent_task_loop = asyncio.get_running_loop()
+        _agent_task_event = asyncio.Event()
+    return _agent_task_event
+
+
+def _fire_agent_task_event() -> None:
+    global _agent_task_event
+    event, _agent_task_event = _agent_task_event, asyncio.Event()
+    if event is not None:
+        event.set()
+
+
+def _notify_agent_tasks() -> None:
+    """唤醒正在长轮询的 Agent；可在任意线程调用。"""
+    loop = _agent_task_loop
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_fire_agent_task_event)
 
 
 @dataclass
@@ -124,7 +165,7 @@ def _get_run_item_ids(run_id: int) -> Optional[List[int]]:
 
 
 def _requeue_stale_agent_runs(db: Session) -> int:
-    deadline = datetime.utcnow() - AGENT_HEARTBEAT_TIMEOUT
+    deadline = models.utcnow() - AGENT_HEARTBEAT_TIMEOUT
     candidates = (
         db.query(models.InspectionRun)
         .filter(
@@ -158,6 +199,7 @@ def _requeue_stale_agent_runs(db: Session) -> int:
     if recovered:
         db.commit()
         logger.warning("已回滚 %s 个超时的 Agent 巡检任务。", recovered)
+        _notify_agent_tasks()
     return recovered
 
 
@@ -316,7 +358,6 @@ def _attach_run_report(db: Session, run: models.InspectionRun) -> models.Inspect
     db.commit()
     db.refresh(run)
     crud.log_action(
-        db,
         action="update",
         entity_type="inspection_run",
         entity_id=run.id,
@@ -325,6 +366,26 @@ def _attach_run_report(db: Session, run: models.InspectionRun) -> models.Inspect
     return run
 
 
+def _parse_page_cursor(cursor: Optional[str]) -> tuple[Optional[datetime], Optional[int]]:
+    if not cursor:
+        return None, None
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        created_at, _, record_id = decoded.rpartition("|")
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="分页游标格式无效。")
+
+
+def _set_next_cursor(response: Response, rows: List[Any], limit: int) -> None:
+    # 仅在本页已取满时返回下一页游标；游标为 "<created_at ISO>|<id>" 的 URL 安全 base64 编码，调用方原样回传即可。
+    if len(rows) < limit:
+        return
+    last = rows[-1]
+    raw = f"{last.created_at.isoformat()}|{last.id}".encode("ascii")
+    response.headers["X-Next-Cursor"] = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
 def _generate_agent_token() -> str:
     return secrets.token_urlsafe(32)
 
@@ -384,12 +445,53 @@ CONNECTION_TEST_TIMEOUT_SECONDS = 8.0
 CONNECTION_TEST_CONNECT_TIMEOUT = 3.0
 CONNECTION_TEST_READ_TIMEOUT = 5.0
 
+# 各组接口（按路径前缀）读写的表；补丁未完成时，仅当涉及的表仍有待执行的补丁才返回 503。
+# 审计日志经 audit_buffer 异步写入，写入失败会留待下次重试，因此只有 /audit-logs 查询依赖 audit_logs。
+SCHEMA_ROUTE_TABLES = (
+    ("/clusters", frozenset({"cluster_configs", "inspection_agents", "inspection_runs", "inspection_results"})),
+    ("/agents", frozenset({"inspection_agents", "cluster_configs"})),
+    ("/agent/", frozenset({"inspection_agents", "cluster_configs", "inspection_runs", "inspection_results", "inspection_items"})),
+    ("/audit-logs", frozenset({"audit_logs"})),
+    ("/inspection-items", frozenset({"inspection_items", "inspection_results"})),
+    ("/inspection-runs", frozenset({"inspection_runs", "inspection_results", "inspection_items", "cluster_configs", "inspection_agents"})),
+)
+
+# 后台表结构升级失败时记录原因，/health 据此返回非 ok，由编排系统重启实例。
+_schema_upgrade_error: Optional[str] = None
+
+
+def _route_needs_pending_schema(path: str) -> bool:
+    for prefix, tables in SCHEMA_ROUTE_TABLES:
+        if path.startswith(prefix):
+            return not tables.isdisjoint(schema_pending_tables)
+    return False
+
+
+@app.middleware("http")
+async def require_schema_ready(request, call_next):
+    # 表结构补丁在后台执行期间，只有读写待补丁表的接口返回 503。
+    if not schema_ready.is_set() and _route_needs_pending_schema(request.url.path):
+        if _schema_upgrade_error is not None:
+            return JSONResponse(
+                status_code=503,
+                content={"detail": f"数据库结构升级失败：{_schema_upgrade_error}"},
+            )
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "数据库结构升级中，请稍后重试。"},
+            headers={"Retry-After": "5"},
+        )
+    return await call_next(request)
+
+
+# CORS 在 require_schema_ready 之后注册，位于外层，503 响应同样带有跨域头。
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -401,12 +503,24 @@ def get_db() -> Session:
         db.close()
 
 
+def get_read_db() -> Session:
+    """只读接口使用的会话，连接为 AUTOCOMMIT，不能用于写入。"""
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def _execute_inspection_run_async(
     run_id: int,
     item_ids: List[int],
     control: RunExecutionControl,
 ) -> None:
     db = SessionLocal()
+    recorded = 0
+    check_results = None
+    prom_client: Optional[PrometheusClient] = None
     try:
         run = crud.get_inspection_run(db, run_id)
         if not run:
@@ -458,7 +572,6 @@ def _execute_inspection_run_async(
             total_items,
         )
 
-        prom_client: Optional[PrometheusClient] = None
         if cluster.prometheus_url:
             prom_client = PrometheusClient(cluster.prometheus_url)
 
@@ -474,6 +587,10 @@ def _execute_inspection_run_async(
                 key = "warning"
             status_counter[key] = status_counter.get(key, 0) + 1
 
+        # 各巡检项并发执行，结果仍按顺序逐条写入并推进进度。
+        check_results = iter_dispatch_checks(
+            [(item.check_type, item.config) for item in remaining_items], context
+        )
         for offset, item in enumerate(remaining_items, start=1):
             target_index = processed_count + offset
             while True:
@@ -503,9 +620,7 @@ def _execute_inspection_run_async(
                     )
                     return
                 break
-            status, detail, suggestion = dispatch_checks(
-                item.check_type, context, item.config
-            )
+            status, detail, suggestion = next(check_results)
             sanitized_detail = _sanitize_optional_text(detail)
             sanitized_suggestion = _sanitize_optional_text(suggestion)
             crud.add_inspection_result(
@@ -515,10 +630,13 @@ def _execute_inspection_run_async(
                 status=status,
                 detail=sanitized_detail,
                 suggestion=sanitized_suggestion,
+                commit=False,
             )
+            # 结果与进度在同一次提交中写入。
             run = crud.update_inspection_run_progress(
                 db, run=run, processed_items=target_index
             )
+            recorded += 1
             normalized_status = (status or "warning").lower()
             if normalized_status not in {"passed", "warning", "failed"}:
                 normalized_status = "warning"
@@ -589,6 +707,18 @@ def _execute_inspection_run_async(
                 processed_items=run.processed_items or 0,
             )
     finally:
+        if check_results is not None:
+            check_results.close()
+        if prom_client is not None:
+            prom_client.close()
+        if recorded:
+            # 逐项写入的结果不单独记审计日志，此处按整次巡检汇总记录一条。
+            crud.log_action(
+                action="update",
+                entity_type="inspection_run",
+                entity_id=run_id,
+                description=f"Recorded {recorded} results for run {run_id}",
+            )
         db.close()
 
 
@@ -601,7 +731,7 @@ def _seed_defaults(db: Session) -> None:
         try:
             _DEFAULT_INSPECTIONS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
             _DEFAULT_INSPECTIONS_SENTINEL.write_text(
-                datetime.utcnow().isoformat(), encoding="utf-8"
+                models.utcnow().isoformat(), encoding="utf-8"
             )
         except Exception:
             logger.debug("无法写入默认巡检项标记文件，继续运行。", exc_info=True)
@@ -630,7 +760,7 @@ def _seed_defaults(db: Session) -> None:
     try:
         _DEFAULT_INSPECTIONS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
         _DEFAULT_INSPECTIONS_SENTINEL.write_text(
-            datetime.utcnow().isoformat(), encoding="utf-8"
+            models.utcnow().isoformat(), encoding="utf-8"
         )
     except Exception:
         logger.debug("写入默认巡检项标记文件失败。", exc_info=True)
@@ -848,13 +978,44 @@ def _log_connection_status(cluster_name: str, status: str, message: Optional[str
 def on_startup() -> None:
     ensure_runtime_directories()
     license_manager.reload()
-    init_db()
+    audit_buffer.start()
+    if init_db_fast():
+        _finish_startup()
+        return
+    # 需要执行表结构补丁时放到后台线程，服务先行启动，补丁完成前由中间件返回 503。
+    threading.Thread(
+        target=_upgrade_schema_in_background, name="schema-upgrade", daemon=True
+    ).start()
+
+
+def _upgrade_schema_in_background() -> None:
+    global _schema_upgrade_error
+    try:
+        upgrade_schema()
+    except Exception as exc:
+        logger.exception("数据库结构升级失败")
+        _schema_upgrade_error = str(exc) or exc.__class__.__name__
+        return
+    _finish_startup()
+
+
+def _finish_startup() -> None:
     with SessionLocal() as db:
         _seed_defaults(db)
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    audit_buffer.stop()
+
+
 @app.get("/health")
-def health_check() -> dict[str, str]:
+def health_check():
+    if _schema_upgrade_error is not None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "error", "detail": f"数据库结构升级失败：{_schema_upgrade_error}"},
+        )
     return {"status": "ok"}
 
 
@@ -906,20 +1067,21 @@ def _present_cluster(
 
 
 @app.get("/clusters", response_model=List[schemas.ClusterConfigOut])
-def list_clusters(db: Session = Depends(get_db)):
+def list_clusters(db: Session = Depends(get_read_db)):
     clusters = crud.list_clusters(db)
     return [_present_cluster(cluster) for cluster in clusters]
 
 
 @app.post("/clusters", response_model=schemas.ClusterConfigOut, status_code=201)
-async def register_cluster(
+def register_cluster(
     file: UploadFile = File(...),
     name: str | None = Form(None),
     prometheus_url: str | None = Form(None),
     db: Session = Depends(get_db),
     _license_guard: None = Depends(require_license_dependency("clusters")),
 ):
-    data = await file.read()
+    # 同步端点由 FastAPI 放入线程池执行，数据库与集群连通性检测不会阻塞事件循环。
+    data = file.file.read()
     if not data:
         raise HTTPException(status_code=400, detail="上传的 kubeconfig 文件为空。")
     try:
@@ -989,7 +1151,7 @@ async def register_cluster(
         cluster,
         connection_status=status,
         connection_message=stored_message,
-        last_checked_at=datetime.utcnow(),
+        last_checked_at=models.utcnow(),
     )
 
     cluster = crud.get_cluster(db, cluster.id)
@@ -1019,13 +1181,13 @@ def test_cluster_connection(cluster_id: int, db: Session = Depends(get_db)):
         cluster,
         connection_status=status,
         connection_message=stored_message,
-        last_checked_at=datetime.utcnow(),
+        last_checked_at=models.utcnow(),
     )
     return _present_cluster(cluster)
 
 
 @app.put("/clusters/{cluster_id}", response_model=schemas.ClusterConfigOut)
-async def update_cluster(
+def update_cluster(
     cluster_id: int,
     db: Session = Depends(get_db),
     name: str | None = Form(None),
@@ -1094,7 +1256,7 @@ async def update_cluster(
 
     new_kubeconfig_path: Optional[str] = None
     if file is not None:
-        data = await file.read()
+        data = file.file.read()
         if not data:
             raise HTTPException(status_code=400, detail="上传的 kubeconfig 文件为空。")
         try:
@@ -1110,10 +1272,15 @@ async def update_cluster(
         sanitized_message = _sanitize_message(message)
         stored_message = sanitized_message or "No additional details."
         connection_message = stored_message
-        connection_checked_at = datetime.utcnow()
+        connection_checked_at = models.utcnow()
 
+    original_prom_url = cluster.prometheus_url
     if update_kwargs:
         cluster = crud.update_cluster(db, cluster, **update_kwargs)
+    if "prometheus_url" in update_kwargs and cluster.prometheus_url != original_prom_url:
+        # 地址变更后不再复用旧地址（以及新地址此前残留）的查询缓存。
+        invalidate_query_cache(original_prom_url)
+        invalidate_query_cache(cluster.prometheus_url)
 
     if mode_value == "agent" or (mode_value is None and cluster.execution_mode == "agent"):
         effective_agent = default_agent_obj or cluster.default_agent
@@ -1143,7 +1310,7 @@ async def update_cluster(
 
 @app.get("/agents", response_model=List[schemas.InspectionAgentOut])
 def list_agents(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _license_guard: None = Depends(require_license_dependency("inspections")),
 ):
     agents = crud.list_inspection_agents(db)
@@ -1252,7 +1419,7 @@ def agent_bootstrap(
             is_enabled=True,
             prometheus_url=_normalize_prometheus_url(payload.prometheus_url),
         )
-        crud.record_agent_heartbeat(db, agent, seen_at=datetime.utcnow())
+        crud.record_agent_heartbeat(db, agent, seen_at=models.utcnow())
         refreshed = crud.get_inspection_agent(db, agent.id)
         if not refreshed:
             raise HTTPException(status_code=500, detail="Agent 注册失败。")
@@ -1267,21 +1434,47 @@ def agent_heartbeat(
     ctx: AgentRequestContext = Depends(_agent_request_dependency),
 ):
     updated = crud.record_agent_heartbeat(
-        ctx.db, ctx.agent, seen_at=payload.reported_at or datetime.utcnow()
+        ctx.db, ctx.agent, seen_at=payload.reported_at or models.utcnow()
     )
     refreshed = crud.get_inspection_agent(ctx.db, updated.id) or updated
     return _serialize_agent(refreshed)
 
 
 @agent_router.get("/tasks", response_model=List[schemas.AgentTaskOut])
-def agent_pull_tasks(
+async def agent_pull_tasks(
     limit: int = Query(5, ge=1, le=50, description="每次获取的任务数量"),
+    wait: int = Query(
+        0, ge=0, le=AGENT_TASK_MAX_WAIT_SECONDS, description="无任务时最长等待秒数（长轮询）"
+    ),
     ctx: AgentRequestContext = Depends(_agent_request_dependency),
 ):
-    crud.record_agent_heartbeat(ctx.db, ctx.agent)
-    runs = crud.list_agent_runs(
-        ctx.db, agent=ctx.agent, statuses=("queued",), limit=limit
-    )
+    # 等待在事件循环上进行，不占用线程池；只有数据库访问放到线程池执行。
+    await run_in_threadpool(crud.record_agent_heartbeat, ctx.db, ctx.agent)
+    deadline = time.monotonic() + wait
+    while True:
+        event = _current_agent_task_event()
+        runs = await run_in_threadpool(_fetch_queued_agent_runs, ctx, limit)
+        remaining = deadline - time.monotonic()
+        if runs or remaining <= 0:
+            break
+        try:
+            await asyncio.wait_for(
+                event.wait(), timeout=min(AGENT_TASK_WAIT_INTERVAL_SECONDS, remaining)
+            )
+        except asyncio.TimeoutError:
+            pass
+    return await run_in_threadpool(_build_agent_tasks, runs)
+
+
+def _fetch_queued_agent_runs(ctx: AgentRequestContext, limit: int) -> List[models.InspectionRun]:
+    runs = crud.list_agent_runs(ctx.db, agent=ctx.agent, statuses=("queued",), limit=limit)
+    if not runs:
+        # 结束当前读事务并归还连接，确保下一轮查询能看到新入队的任务。
+        ctx.db.rollback()
+    return runs
+
+
+def _build_agent_tasks(runs: List[models.InspectionRun]) -> List[schemas.AgentTaskOut]:
     tasks: List[schemas.AgentTaskOut] = []
     for run in runs:
         plan_items = _parse_run_plan(run)
@@ -1350,23 +1543,21 @@ def agent_submit_results(
     crud.record_agent_heartbeat(ctx.db, ctx.agent)
     crud.delete_run_results(ctx.db, run)
     status_counter: dict[str, int] = {}
-    processed_total = 0
+    entries: list[dict] = []
     for result in payload.results:
         normalized_status = (result.status or "").strip().lower()
         if normalized_status not in {"passed", "warning", "failed"}:
             normalized_status = "warning"
-        detail = _sanitize_optional_text(result.detail)
-        suggestion = _sanitize_optional_text(result.suggestion)
-        crud.add_run_result_by_item_id(
-            ctx.db,
-            run,
-            result.item_id,
-            normalized_status,
-            detail,
-            suggestion,
+        entries.append(
+            {
+                "item_id": result.item_id,
+                "status": normalized_status,
+                "detail": _sanitize_optional_text(result.detail),
+                "suggestion": _sanitize_optional_text(result.suggestion),
+            }
         )
         status_counter[normalized_status] = status_counter.get(normalized_status, 0) + 1
-        processed_total += 1
+    processed_total = crud.bulk_add_inspection_results(ctx.db, run=run, results=entries)
 
     run = crud.get_inspection_run(ctx.db, run.id)
     total_items = run.total_items or processed_total
@@ -1437,12 +1628,20 @@ def delete_cluster(
 
 
 @app.get("/audit-logs", response_model=List[schemas.AuditLogOut])
-def list_audit_logs(limit: int = 100, db: Session = Depends(get_db)):
-    return crud.list_audit_logs(db, limit=limit)
+def list_audit_logs(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值"),
+    db: Session = Depends(get_read_db),
+):
+    before, before_id = _parse_page_cursor(cursor)
+    logs = crud.list_audit_logs(db, limit=limit, before=before, before_id=before_id)
+    _set_next_cursor(response, logs, limit)
+    return logs
 
 
 @app.get("/inspection-items", response_model=List[schemas.InspectionItemOut])
-def list_inspection_items(db: Session = Depends(get_db)):
+def list_inspection_items(db: Session = Depends(get_read_db)):
     return crud.get_inspection_items(db)
 
 
@@ -1450,10 +1649,10 @@ def list_inspection_items(db: Session = Depends(get_db)):
     "/inspection-items/export",
     response_model=schemas.InspectionItemsExportOut,
 )
-def export_inspection_items(db: Session = Depends(get_db)):
+def export_inspection_items(db: Session = Depends(get_read_db)):
     items = crud.get_inspection_items(db)
     return {
-        "exported_at": datetime.utcnow(),
+        "exported_at": models.utcnow(),
         "items": items,
     }
 
@@ -1463,11 +1662,11 @@ def export_inspection_items(db: Session = Depends(get_db)):
     response_model=schemas.InspectionItemsImportResult,
     status_code=201,
 )
-async def import_inspection_items(
+def import_inspection_items(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
 ):
-    raw_bytes = await file.read()
+    raw_bytes = file.file.read()
     if not raw_bytes:
         raise HTTPException(status_code=400, detail="导入文件为空")
     try:
@@ -1568,7 +1767,7 @@ async def import_inspection_items(
             existing.check_type = payload.check_type
             existing.is_archived = False
             existing.set_config(config)
-            existing.updated_at = datetime.utcnow()
+            existing.updated_at = models.utcnow()
             db.add(existing)
             updated_items.append(existing)
         else:
@@ -1587,7 +1786,6 @@ async def import_inspection_items(
     for item in created_items:
         db.refresh(item)
         crud.log_action(
-            db,
             action="create",
             entity_type="inspection_item",
             entity_id=item.id,
@@ -1597,7 +1795,6 @@ async def import_inspection_items(
     for item in updated_items:
         db.refresh(item)
         crud.log_action(
-            db,
             action="update",
             entity_type="inspection_item",
             entity_id=item.id,
@@ -1685,7 +1882,9 @@ def _serialize_run(run: models.InspectionRun) -> schemas.InspectionRunOut:
     )
 
 
-def _serialize_run_list(run: models.InspectionRun) -> schemas.InspectionRunListOut:
+def _serialize_run_list(
+    run: models.InspectionRun, cluster_seq: Optional[int] = None
+) -> schemas.InspectionRunListOut:
     cluster = run.cluster
     if cluster is None:
         raise HTTPException(status_code=500, detail="Cluster information missing.")
@@ -1706,6 +1905,7 @@ def _serialize_run_list(run: models.InspectionRun) -> schemas.InspectionRunListO
         executor=run.executor,
         agent_status=run.agent_status,
         agent_id=run.agent_id,
+        cluster_seq=cluster_seq,
     )
 
 
@@ -1769,6 +1969,8 @@ def trigger_inspection(
 
     if executor == "server":
         _submit_run_execution(run.id, list(run_in.item_ids))
+    else:
+        _notify_agent_tasks()
 
     run = crud.get_inspection_run(db, run.id)
     if not run:
@@ -1777,10 +1979,20 @@ def trigger_inspection(
 
 
 @app.get("/inspection-runs", response_model=List[schemas.InspectionRunListOut])
-def list_inspection_runs(db: Session = Depends(get_db)):
+def list_inspection_runs(
+    response: Response,
+    limit: int = Query(100, ge=0, le=500, description="每页条数；传 0 不分页，返回全部记录"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值"),
+    db: Session = Depends(get_db),
+):
     _requeue_stale_agent_runs(db)
-    runs = crud.list_inspection_runs(db)
-    return [_serialize_run_list(run) for run in runs]
+    before, before_id = _parse_page_cursor(cursor)
+    page_limit = limit or None
+    runs = crud.list_inspection_runs(db, before=before, before_id=before_id, limit=page_limit)
+    if page_limit is not None:
+        _set_next_cursor(response, runs, page_limit)
+    sequences = crud.get_run_cluster_sequences(db, runs)
+    return [_serialize_run_list(run, sequences.get(run.id)) for run in runs]
 
 
 @app.get("/inspection-runs/{run_id}", response_model=schemas.InspectionRunOut)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, Boolean
 from sqlalchemy.orm import relationship
 
 from .database import Base
 
 
+def utcnow() -> datetime:
+    """当前 UTC 时间（不带 tzinfo），与各表 DateTime 字段的存储约定一致。"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class ClusterConfig(Base):
     __tablename__ = "cluster_configs"
 
@@ -19,9 +24,9 @@ class ClusterConfig(Base):
     connection_status = Column(String(20), nullable=False, default="unknown")
     connection_message = Column(Text, nullable=True)
     last_checked_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=utcnow, onupdate=utcnow, nullable=False
     )
 
     execution_mode = Column(String(20), nullable=False, default="server")
@@ -71,9 +76,9 @@ class InspectionItem(Base):
     config_json = Column(Text, nullable=True)
     is_archived = Column(Boolean, nullable=False, default=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=utcnow, onupdate=utcnow, nullable=False
     )
 
     @property
@@ -97,6 +102,16 @@ class InspectionItem(Base):
 
 class InspectionRun(Base):
     __tablename__ = "inspection_runs"
+    __table_args__ = (
+        Index("ix_inspection_runs_created_at_id", "created_at", "id"),
+        Index(
+            "ix_inspection_runs_agent_active",
+            "agent_id",
+            "executor",
+            "agent_status",
+            "created_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     operator = Column(String(100), nullable=True)
@@ -110,7 +125,7 @@ class InspectionRun(Base):
     report_path = Column(String(255), nullable=True)
     total_items = Column(Integer, nullable=False, default=0)
     processed_items = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     completed_at = Column(DateTime, nullable=True)
     plan_json = Column(Text, nullable=True)
     executor = Column(String(20), nullable=False, default="server")
@@ -145,13 +160,14 @@ class InspectionResult(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (Index("ix_audit_logs_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     action = Column(String(50), nullable=False)
     entity_type = Column(String(50), nullable=False)
     entity_id = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
 
 
 class InspectionAgent(Base):
@@ -169,9 +185,9 @@ class InspectionAgent(Base):
     is_enabled = Column(Boolean, nullable=False, default=True)
     last_seen_at = Column(DateTime, nullable=True)
     prometheus_url = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=utcnow, onupdate=utcnow, nullable=False
     )
 
     cluster = relationship("ClusterConfig", back_populates="agents", foreign_keys=[cluster_id])
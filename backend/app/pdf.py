@@ -25,7 +25,7 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.pdfbase.ttfonts import TTFont
 
-from .models import InspectionResult, InspectionRun
+from .models import InspectionResult, InspectionRun, utcnow
 from .schemas import _extract_connection_meta
 
 REPORTS_ROOT = Path("data/reports")
@@ -120,7 +120,7 @@ def generate_markdown_report(
     lines.append(f"| 集群版本 | {version_label} |")
     lines.append(f"| 节点数量 | {node_count_label} |")
     lines.append(f"| 巡检开始时间 | {_format_dt(run.created_at)} |")
-    lines.append(f"| 巡检完成时间 | {_format_dt(run.completed_at or datetime.utcnow())} |")
+    lines.append(f"| 巡检完成时间 | {_format_dt(run.completed_at or utcnow())} |")
     lines.append("")
 
     lines.append("## 巡检概览")
@@ -346,7 +346,7 @@ def generate_pdf_report(
         ("集群版本", version_label),
         ("节点数量", node_count_label),
         ("巡检开始时间", format_dt(run.created_at)),
-        ("巡检完成时间", format_dt(run.completed_at or datetime.utcnow())),
+        ("巡检完成时间", format_dt(run.completed_at or utcnow())),
     ]
     meta_table_data = [
         [Paragraph(label, styles["MetaLabel"]), Paragraph(value, styles["MetaValue"])]
@@ -1,26 +1,106 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+QUERY_MANY_MAX_WORKERS = 8
+
+QUERY_CACHE_TTL_SECONDS = 20.0
+QUERY_CACHE_MAX_ENTRIES = 256
+QUERY_CACHE_MAX_KEY_LENGTH = 2048
+
+QueryResult = Tuple[bool, List[dict], str]
+
+
+class _QueryCache:
+    """按 (Prometheus 地址, 表达式) 缓存成功的即时查询结果，超过 TTL 即失效。"""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, QueryResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[QueryResult]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def set(self, key: Tuple[str, str], result: QueryResult) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, base_url: Optional[str] = None) -> None:
+        with self._lock:
+            if base_url is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == base_url]:
+                del self._entries[key]
+
+
+# 每次巡检都会新建客户端，缓存放在模块级以便跨巡检复用；TTL 与 rate(...[5m]) 的分辨率相当。
+_query_cache = _QueryCache(QUERY_CACHE_TTL_SECONDS, QUERY_CACHE_MAX_ENTRIES)
+
+
+def _normalize_expression(expression: str) -> str:
+    return " ".join(expression.split())
+
+
+def invalidate_query_cache(base_url: Optional[str]) -> None:
+    """Prometheus 地址变更时清除该地址的缓存结果。"""
+    if base_url:
+        _query_cache.clear(base_url.rstrip("/"))
 
 
 class PrometheusClient:
     """Minimal Prometheus HTTP API client for instant queries."""
 
     def __init__(self, base_url: str, timeout: float = 5.0, verify_ssl: bool = True):
-        self.base_url = base_url.rstrip("/")
+        self.base_url = (base_url or "").rstrip("/")
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        # 复用同一个 Session 的 keep-alive 连接，避免每次查询重新建立 TCP/TLS。
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=QUERY_MANY_MAX_WORKERS
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-    def query(self, expression: str) -> Tuple[bool, List[dict], str]:
+    def query(self, expression: str) -> QueryResult:
         """Execute an instant query. Returns (success, results, message)."""
         if not self.base_url:
             return False, [], "Prometheus base URL is empty."
 
+        normalized = _normalize_expression(expression)
+        cache_key = (self.base_url, normalized)
+        cacheable = len(normalized) <= QUERY_CACHE_MAX_KEY_LENGTH
+        if cacheable:
+            cached = _query_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         url = f"{self.base_url}/api/v1/query"
         try:
-            response = requests.get(
+            response = self._session.get(
                 url,
                 params={"query": expression},
                 timeout=self.timeout,
@@ -53,8 +133,24 @@ class PrometheusClient:
 
         data = payload.get("data", {})
         results = data.get("result", [])
+        if cacheable:
+            _query_cache.set(cache_key, (True, results, ""))
         return True, results, ""
 
+    def query_many(self, expressions: Iterable[str]) -> Dict[str, QueryResult]:
+        """并发执行多条即时查询，返回 {表达式: (success, results, message)}。"""
+        unique = list(dict.fromkeys(expressions))
+        if not unique:
+            return {}
+        if len(unique) == 1:
+            return {unique[0]: self.query(unique[0])}
+        workers = min(QUERY_MANY_MAX_WORKERS, len(unique))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prom-query") as pool:
+            return dict(zip(unique, pool.map(self.query, unique)))
+
+    def close(self) -> None:
+        self._session.close()
+
     @staticmethod
     def extract_value(sample: dict) -> float | None:
         try:
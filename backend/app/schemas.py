@@ -221,6 +221,7 @@ class InspectionRunListOut(BaseModel):
     executor: str
     agent_status: Optional[str]
     agent_id: Optional[int]
+    cluster_seq: Optional[int] = None
 
     @computed_field(return_type=Optional[str])
     @property
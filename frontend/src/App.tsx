@@ -433,7 +433,9 @@ const createRunDisplayIdMap = (
           run.cluster_name ??
           `cluster-${clusterId}`;
         const slug = normaliseClusterName(clusterName);
-        displayIds[run.id] = `${slug}-${String(index + 1).padStart(2, "0")}`;
+        // 巡检历史按页加载，序号优先使用服务端按集群计算的 cluster_seq。
+        const sequence = run.cluster_seq ?? index + 1;
+        displayIds[run.id] = `${slug}-${String(sequence).padStart(2, "0")}`;
       });
   });
 
@@ -518,7 +520,8 @@ const areRunListsEqual = (
       previous.agent_status !== run.agent_status ||
       previous.agent_status_label !== run.agent_status_label ||
       previous.agent_id !== run.agent_id ||
-      previous.agent_name !== run.agent_name
+      previous.agent_name !== run.agent_name ||
+      previous.cluster_seq !== run.cluster_seq
     ) {
       return false;
     }
@@ -1313,7 +1316,35 @@ const KubeconfigModal = ({
   );
 };
 
-interface HistoryViewProps {
+interface LoadMoreRunsProps {
+  hasMoreRuns: boolean;
+  loadingMoreRuns: boolean;
+  onLoadMoreRuns: () => Promise<void>;
+}
+
+const LoadMoreRuns = ({
+  hasMoreRuns,
+  loadingMoreRuns,
+  onLoadMoreRuns,
+}: LoadMoreRunsProps) => {
+  if (!hasMoreRuns) {
+    return null;
+  }
+  return (
+    <div className="table-load-more">
+      <button
+        type="button"
+        className="secondary"
+        onClick={() => void onLoadMoreRuns()}
+        disabled={loadingMoreRuns}
+      >
+        {loadingMoreRuns ? "加载中..." : "加载更早的巡检记录"}
+      </button>
+    </div>
+  );
+};
+
+interface HistoryViewProps extends LoadMoreRunsProps {
   runs: InspectionRunListItem[];
   onRefreshRuns: () => Promise<void>;
   onDeleteRun: (run: InspectionRunListItem) => Promise<void>;
@@ -1329,6 +1360,9 @@ interface HistoryViewProps {
 
 const HistoryView = ({
   runs,
+  hasMoreRuns,
+  loadingMoreRuns,
+  onLoadMoreRuns,
   onRefreshRuns,
   onDeleteRun,
   onDeleteRunsBulk,
@@ -1756,11 +1790,16 @@ const HistoryView = ({
           </div>
         </div>
       )}
+      <LoadMoreRuns
+        hasMoreRuns={hasMoreRuns}
+        loadingMoreRuns={loadingMoreRuns}
+        onLoadMoreRuns={onLoadMoreRuns}
+      />
     </section>
   );
 };
 
-interface ClusterDetailProps {
+interface ClusterDetailProps extends LoadMoreRunsProps {
   clusters: ClusterConfig[];
   items: InspectionItem[];
   runs: InspectionRunListItem[];
@@ -1797,7 +1836,7 @@ interface ClusterDetailProps {
   ) => Promise<void>;
 }
 
-interface ClusterDetailContentProps {
+interface ClusterDetailContentProps extends LoadMoreRunsProps {
   cluster: ClusterConfig;
   clusterSlug: string;
   items: InspectionItem[];
@@ -1840,6 +1879,9 @@ const ClusterDetailContent = ({
   clusterSlug,
   items,
   runs,
+  hasMoreRuns,
+  loadingMoreRuns,
+  onLoadMoreRuns,
   selectedIds,
   setSelectedIds,
   operator,
@@ -2670,6 +2712,11 @@ const ClusterDetailContent = ({
             </div>
           </div>
         )}
+        <LoadMoreRuns
+          hasMoreRuns={hasMoreRuns}
+          loadingMoreRuns={loadingMoreRuns}
+          onLoadMoreRuns={onLoadMoreRuns}
+        />
       </section>
     </>
   );
@@ -2679,6 +2726,9 @@ const ClusterDetailView = ({
   clusters,
   items,
   runs,
+  hasMoreRuns,
+  loadingMoreRuns,
+  onLoadMoreRuns,
   selectedIds,
   setSelectedIds,
   operator,
@@ -2776,6 +2826,9 @@ const ClusterDetailView = ({
       clusterSlug={clusterSlug}
       items={items}
       runs={runs}
+      hasMoreRuns={hasMoreRuns}
+      loadingMoreRuns={loadingMoreRuns}
+      onLoadMoreRuns={onLoadMoreRuns}
       selectedIds={selectedIds}
       setSelectedIds={setSelectedIds}
       operator={operator}
@@ -2808,7 +2861,7 @@ const ClusterDetailView = ({
   );
 };
 
-interface RunDetailProps {
+interface RunDetailProps extends LoadMoreRunsProps {
   clusters: ClusterConfig[];
   items: InspectionItem[];
   runs: InspectionRunListItem[];
@@ -2826,6 +2879,9 @@ const RunDetailView = ({
   clusters,
   items,
   runs,
+  hasMoreRuns,
+  loadingMoreRuns,
+  onLoadMoreRuns,
   onDeleteRun,
   onCancelRun,
   clusterDisplayIds,
@@ -2906,8 +2962,20 @@ const RunDetailView = ({
     }
     return Object.keys(runDisplayIds).length > 0;
   }, [runKey, runs.length, runDisplayIds]);
+  // 编号对应的记录可能还在未加载的更早页中，加载完全部页仍找不到才判定无效。
   const isRunIdInvalid =
-    Number.isNaN(numericRunId) && isDisplayLookupReady;
+    Number.isNaN(numericRunId) && isDisplayLookupReady && !hasMoreRuns;
+
+  useEffect(() => {
+    if (
+      Number.isNaN(numericRunId) &&
+      isDisplayLookupReady &&
+      hasMoreRuns &&
+      !loadingMoreRuns
+    ) {
+      void onLoadMoreRuns();
+    }
+  }, [numericRunId, isDisplayLookupReady, hasMoreRuns, loadingMoreRuns, onLoadMoreRuns]);
 
   useEffect(() => {
     if (!isDisplayLookupReady) {
@@ -2920,6 +2988,9 @@ const RunDetailView = ({
       logWithTimestamp("error", "巡检编号无效: %s", runKey ?? "");
       return;
     }
+    if (Number.isNaN(numericRunId)) {
+      return;
+    }
     setError(null);
     setLoading(true);
     const runLabel = runDisplayIds[numericRunId] ?? numericRunId;
@@ -5067,6 +5138,9 @@ const App = () => {
   const [clusters, setClusters] = useState<ClusterConfig[]>([]);
   const [agents, setAgents] = useState<InspectionAgent[]>([]);
   const [runs, setRuns] = useState<InspectionRunListItem[]>([]);
+  const [runsCursor, setRunsCursor] = useState<string | null>(null);
+  const [loadingMoreRuns, setLoadingMoreRuns] = useState(false);
+  const loadedRunPagesRef = useRef(1);
   const [items, setItems] = useState<InspectionItem[]>([]);
 
   const [clusterError, setClusterError] = useState<string | null>(null);
@@ -5499,10 +5573,21 @@ const backgroundLocation =
   const refreshRuns = useCallback(async () => {
     try {
       logWithTimestamp("info", "开始获取巡检历史");
-      const data = await getInspectionRuns();
+      // 只重新获取已加载的页数，更早的记录在用户点击“加载更早的巡检记录”时再取。
+      const data: InspectionRunListItem[] = [];
+      let cursor: string | null = null;
+      for (let index = 0; index < loadedRunPagesRef.current; index += 1) {
+        const page = await getInspectionRuns(cursor);
+        data.push(...page.runs);
+        cursor = page.nextCursor;
+        if (!cursor) {
+          break;
+        }
+      }
       setRuns((previous) =>
         areRunListsEqual(previous, data) ? previous ?? data : data
       );
+      setRunsCursor(cursor);
       logWithTimestamp("info", "巡检历史获取成功,数量: %d", data.length);
       return data;
     } catch (err) {
@@ -5514,6 +5599,34 @@ const backgroundLocation =
     }
   }, [currentNoticeScope, showClusterNotice]);
 
+  const loadMoreRuns = useCallback(async () => {
+    if (!runsCursor || loadingMoreRuns) {
+      return;
+    }
+    setLoadingMoreRuns(true);
+    try {
+      logWithTimestamp("info", "开始加载更早的巡检历史");
+      const page = await getInspectionRuns(runsCursor);
+      loadedRunPagesRef.current += 1;
+      setRuns((previous) => {
+        const knownIds = new Set(previous.map((run) => run.id));
+        return [
+          ...previous,
+          ...page.runs.filter((run) => !knownIds.has(run.id)),
+        ];
+      });
+      setRunsCursor(page.nextCursor);
+      logWithTimestamp("info", "更早的巡检历史加载成功,数量: %d", page.runs.length);
+    } catch (err) {
+      const message =
+        err instanceof Error ? err.message : "加载更早的巡检历史失败";
+      logWithTimestamp("error", "加载更早的巡检历史失败: %s", message);
+      showClusterNotice(currentNoticeScope, message, "error");
+    } finally {
+      setLoadingMoreRuns(false);
+    }
+  }, [runsCursor, loadingMoreRuns, currentNoticeScope, showClusterNotice]);
+
   const handleCreateAgent = useCallback(
     async (payload: {
       name: string;
@@ -6775,6 +6888,9 @@ const hasManualKubeconfig = useMemo(
             element={
               <HistoryView
                 runs={runs}
+                hasMoreRuns={runsCursor !== null}
+                loadingMoreRuns={loadingMoreRuns}
+                onLoadMoreRuns={loadMoreRuns}
                 onRefreshRuns={refreshRuns}
                 onDeleteRun={handleDeleteRun}
                 onDeleteRunsBulk={(ids) =>
@@ -6797,6 +6913,9 @@ const hasManualKubeconfig = useMemo(
                 clusters={clusters}
                 items={sortedItems}
                 runs={runs}
+                hasMoreRuns={runsCursor !== null}
+                loadingMoreRuns={loadingMoreRuns}
+                onLoadMoreRuns={loadMoreRuns}
                 selectedIds={selectedItemIds}
                 setSelectedIds={setSelectedItemIds}
                 operator={operator}
@@ -6836,6 +6955,9 @@ const hasManualKubeconfig = useMemo(
                   clusters={clusters}
                   items={sortedItems}
                   runs={runs}
+                  hasMoreRuns={runsCursor !== null}
+                  loadingMoreRuns={loadingMoreRuns}
+                  onLoadMoreRuns={loadMoreRuns}
                   onDeleteRun={handleDeleteRunById}
                 onCancelRun={handleCancelRunById}
                 clusterDisplayIds={clusterDisplayIds}
@@ -8,13 +8,17 @@ import {
   InspectionItemsImportResult,
   InspectionRun,
   InspectionRunListItem,
+  InspectionRunPage,
   LicenseStatus,
 } from "./types";
 
 const API_BASE = appConfig.apiBaseUrl.replace(/\/$/, "");
 
+const INSPECTION_RUNS_PAGE_SIZE = 100;
+
 interface RequestOptions {
   timeoutMs?: number;
+  onResponse?: (response: Response) => void;
 }
 
 async function request<T>(
@@ -68,6 +72,8 @@ async function request<T>(
     throw new Error(message || "Request failed");
   }
 
+  options?.onResponse?.(response);
+
   if (response.status === 204) {
     return {} as T;
   }
@@ -103,8 +109,27 @@ export function createInspectionRun(
   });
 }
 
-export function getInspectionRuns(): Promise<InspectionRunListItem[]> {
-  return request<InspectionRunListItem[]>("/inspection-runs");
+export async function getInspectionRuns(
+  cursor?: string | null
+): Promise<InspectionRunPage> {
+  // 每次只取一页，下一页游标取自响应头 X-Next-Cursor，为空表示没有更早的记录。
+  const params = new URLSearchParams({
+    limit: String(INSPECTION_RUNS_PAGE_SIZE),
+  });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  const page: InspectionRunPage = { runs: [], nextCursor: null };
+  page.runs = await request<InspectionRunListItem[]>(
+    `/inspection-runs?${params.toString()}`,
+    undefined,
+    {
+      onResponse: (response) => {
+        page.nextCursor = response.headers.get("X-Next-Cursor");
+      },
+    }
+  );
+  return page;
 }
 
 export function getInspectionRun(runId: number): Promise<InspectionRun> {
@@ -88,6 +88,12 @@ export type InspectionRunListItem = {
   agent_status_label?: string | null;
   agent_id?: number | null;
   agent_name?: string | null;
+  cluster_seq?: number | null;
+};
+
+export type InspectionRunPage = {
+  runs: InspectionRunListItem[];
+  nextCursor: string | null;
 };
 
 export type InspectionItemsExportPayload = {